@@ -2,21 +2,34 @@
 
 from __future__ import annotations
 
+from collections import Counter
+import functools
+import time
+from typing import Any, Awaitable, Callable
+
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
-from homeassistant.const import CONF_DEVICE_ID, CONF_TOKEN
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, ServiceCall, SupportsResponse, callback
+from homeassistant.const import CONF_DEVICE_ID, CONF_TOKEN, EVENT_HOMEASSISTANT_CLOSE, STATE_HOME, STATE_ON
 from homeassistant.helpers import (
     config_validation as cv,
     device_registry as dr,
     entity_registry as er,
 )
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.util import dt as dt_util
 import logging
 
-from .api import PalgateApiClient
+from .api import PalgateApiClient, create_command_session, get_device_read_cache, parse_device_id
+from .coordinator import async_get_account_coordinator
+from .dispatcher import get_account_dispatcher, request_priority
+from .controller import async_get_controller
+from .log import PalgateLogCollector, async_remove_log
+from .roster import PalgateUserRoster, async_remove_roster, normalize_phone
+from .user_sync import USER_SETTINGS_SCHEMA, compute_user_diff, load_user_file
 from .const import DOMAIN as PALGATE_DOMAIN
 from .const import *
 
@@ -25,30 +38,107 @@ _LOGGER: logging.Logger = logging.getLogger(__name__)
 # ------------------------------------------------------------------
 # Service schemas - intentionally lean; user record fields are
 # passed through opaquely via "settings" to avoid coupling our
-# code to the Palgate API's user record structure.
+# code to the Palgate API's user record structure. sync_users is
+# the exception: it diffs settings, so they must be known fields
+# (user_sync.USER_SETTINGS_SCHEMA).
 # ------------------------------------------------------------------
 
 _ENTITY_FIELD   = {vol.Required("entity_id"): cv.entity_id}
 _PHONE_FIELD    = {vol.Required("phone"): cv.string}
 _SETTINGS_FIELD = {vol.Optional("settings"): dict}
 
-_SVC_GET_DEVICE_USERS  = vol.Schema({**_ENTITY_FIELD})
+_SVC_GET_DEVICE_USERS  = vol.Schema({
+    **_ENTITY_FIELD,
+    vol.Optional("page_size", default=USERS_PAGE_SIZE): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+    vol.Optional("concurrency", default=USERS_PAGE_CONCURRENCY): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+})
 _SVC_GET_USER_SETTINGS = vol.Schema({**_ENTITY_FIELD, **_PHONE_FIELD})
 _SVC_ADD_USER          = vol.Schema({**_ENTITY_FIELD, **_PHONE_FIELD, **_SETTINGS_FIELD})
 _SVC_REMOVE_USER       = vol.Schema({**_ENTITY_FIELD, **_PHONE_FIELD})
 _SVC_SET_USER_SETTINGS = vol.Schema({**_ENTITY_FIELD, **_PHONE_FIELD, **_SETTINGS_FIELD})
-_SVC_GET_DEVICE_LOG    = vol.Schema({**_ENTITY_FIELD})
+_LOG_FILTER_FIELDS     = {
+    vol.Optional("since"): cv.datetime,
+    vol.Optional("until"): cv.datetime,
+    vol.Optional("user"): cv.string,
+}
+_SVC_GET_DEVICE_LOG    = vol.Schema({
+    **_ENTITY_FIELD,
+    **_LOG_FILTER_FIELDS,
+    vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+})
+_SVC_PREPARE_OPEN      = vol.Schema({
+    **_ENTITY_FIELD,
+    vol.Optional("hold", default=PREPARE_HOLD): vol.All(vol.Coerce(float), vol.Range(min=1, max=600)),
+})
+_SVC_QUERY_LOG_ARCHIVE = vol.Schema({
+    **_ENTITY_FIELD,
+    **_LOG_FILTER_FIELDS,
+    vol.Optional("limit", default=ARCHIVE_QUERY_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1, max=100000)),
+})
+_SVC_SEARCH_USERS      = vol.Schema({
+    **_ENTITY_FIELD,
+    vol.Required("query"): cv.string,
+    vol.Optional("limit", default=20): vol.All(vol.Coerce(int), vol.Range(min=1, max=500)),
+})
+_BULK_RATE_FIELDS      = {
+    vol.Optional("concurrency", default=BULK_CONCURRENCY): vol.All(vol.Coerce(int), vol.Range(min=1, max=50)),
+    vol.Optional("rate_limit", default=BULK_RATE_LIMIT): vol.All(vol.Coerce(float), vol.Range(min=0)),
+}
+_SVC_BULK_USERS        = vol.Schema({
+    **_ENTITY_FIELD,
+    vol.Required("users"): vol.All(
+        cv.ensure_list, [vol.Schema({**_PHONE_FIELD, **_SETTINGS_FIELD})], vol.Length(min=1)
+    ),
+    **_BULK_RATE_FIELDS,
+})
+_SVC_SYNC_USERS        = vol.All(
+    vol.Schema({
+        **_ENTITY_FIELD,
+        vol.Exclusive("users", "source"): vol.All(
+            cv.ensure_list, [vol.Schema({**_PHONE_FIELD, vol.Optional("settings"): USER_SETTINGS_SCHEMA})]
+        ),
+        vol.Exclusive("file", "source"): cv.string,
+        vol.Optional("remove_missing", default=False): cv.boolean,
+        vol.Optional("dry_run", default=False): cv.boolean,
+        **_BULK_RATE_FIELDS,
+    }),
+    cv.has_at_least_one_key("users", "file"),
+)
 
 
-def _get_api(hass: HomeAssistant, entity_id: str) -> PalgateApiClient:
-    """Resolve a cover entity_id to its shared PalgateApiClient."""
+def _get_entry_data(hass: HomeAssistant, entity_id: str) -> dict:
+    """Resolve a cover entity_id to its config entry's shared data."""
 
     entry_id = er.async_get(hass).async_get(entity_id).config_entry_id
 
     entry_data = hass.data.get(PALGATE_DOMAIN, {}).get(entry_id)
     if not entry_data:
         raise ServiceValidationError(f"No Palgate data found for {entity_id}")
-    return entry_data[DATA_API]
+    return entry_data
+
+
+def _get_api(hass: HomeAssistant, entity_id: str) -> PalgateApiClient:
+    """Resolve a cover entity_id to its shared PalgateApiClient."""
+    return _get_entry_data(hass, entity_id)[DATA_API]
+
+
+def _get_roster(hass: HomeAssistant, entity_id: str) -> PalgateUserRoster:
+    """Resolve a cover entity_id to its gate's local user roster."""
+    return _get_entry_data(hass, entity_id)[DATA_ROSTER]
+
+
+def _get_log(hass: HomeAssistant, entity_id: str) -> PalgateLogCollector:
+    """Resolve a cover entity_id to its gate's local access log."""
+    return _get_entry_data(hass, entity_id)[DATA_LOG]
+
+
+def _log_time_range(call: ServiceCall) -> tuple[float | None, float | None]:
+    """since / until of a log query as unix timestamps."""
+    since, until = call.data.get("since"), call.data.get("until")
+    return (
+        dt_util.as_timestamp(since) if since else None,
+        dt_util.as_timestamp(until) if until else None,
+    )
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -67,10 +157,60 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         seconds_to_close=entry.data[CONF_ADVANCED][CONF_SECONDS_TO_CLOSE],
         allow_invert_as_stop=entry.data[CONF_ADVANCED][CONF_ALLOW_INVERT_AS_STOP],
         session=async_get_clientsession(hass),
+        command_session=create_command_session(),
+        dispatcher=get_account_dispatcher(hass, entry.data[CONF_PHONE_NUMBER]),
+        read_cache=get_device_read_cache(hass, parse_device_id(entry.data[CONF_DEVICE_ID])[0]),
     )
 
+    # Shared per linked phone - one /devices fetch per interval for all its gates
+    coordinator = await async_get_account_coordinator(hass, api)
+
+    # User index, access log, its archive and events - shared by the entries of the controller's outputs
+    controller = await async_get_controller(hass, api)
+    entry.async_on_unload(controller.async_add_api(api))
+
     hass.data.setdefault(PALGATE_DOMAIN, {})
-    hass.data[PALGATE_DOMAIN][entry.entry_id] = {DATA_API: api}
+    hass.data[PALGATE_DOMAIN][entry.entry_id] = {
+        DATA_API: api,
+        DATA_COORDINATOR: coordinator,
+        DATA_ROSTER: controller.roster,
+        DATA_LOG: controller.log,
+        DATA_ARCHIVE: controller.archive,
+        DATA_LOG_POLLER: controller.log_poller,
+    }
+
+    # Poll the log fast while the gate moves
+    entry.async_on_unload(controller.log_poller.async_track_gate(api))
+    entry.async_on_unload(api.add_listener(coordinator.async_tighten))
+    entry.async_on_unload(api.async_close)
+
+    async def _async_close_api(_: Event) -> None:
+        await api.async_close()
+
+    # Entries are not unloaded at shutdown - close the command pool with HA's own sessions
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_api)
+    )
+
+    # Optional trigger entity (e.g. an approach sensor) arming the fast open path
+    if prepare_entity := entry.data[CONF_ADVANCED].get(CONF_PREPARE_OPEN_ENTITY):
+
+        async def _async_prepare_open() -> None:
+            try:
+                await api.prepare_open()
+            except HomeAssistantError as exc:
+                _LOGGER.debug(f"prepare_open of {api.device_id} failed: {exc}")
+
+        @callback
+        def _prepare_entity_changed(event: Event[EventStateChangedData]) -> None:
+            if (new_state := event.data["new_state"]) and new_state.state in (STATE_ON, STATE_HOME):
+                entry.async_create_background_task(
+                    hass, _async_prepare_open(), f"{PALGATE_DOMAIN} prepare open {entry.entry_id}"
+                )
+
+        entry.async_on_unload(
+            async_track_state_change_event(hass, [prepare_entity], _prepare_entity_changed)
+        )
 
     # Register a unique device for this gate
     device_registry = dr.async_get(hass)
@@ -100,6 +240,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if unload_ok:
         hass.data[PALGATE_DOMAIN].pop(entry.entry_id, None)
+        _prune_shared(hass)
 
     # Unregister services when the last entry is gone
     if not hass.data.get(PALGATE_DOMAIN):
@@ -108,6 +249,48 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+@callback
+def _prune_shared(hass: HomeAssistant) -> None:
+    """Forget resources shared between entries once no loaded or loading entry uses them."""
+
+    active = [
+        entry for entry in hass.config_entries.async_entries(PALGATE_DOMAIN)
+        if entry.state in (ConfigEntryState.LOADED, ConfigEntryState.SETUP_IN_PROGRESS)
+    ]
+
+    base_device_ids = {parse_device_id(entry.data[CONF_DEVICE_ID])[0] for entry in active}
+    read_caches     = hass.data.get(DATA_READ_CACHES, {})
+    for base_device_id in set(read_caches) - base_device_ids:
+        del read_caches[base_device_id]
+
+    controllers = hass.data.get(DATA_CONTROLLERS, {})
+    for base_device_id in set(controllers) - base_device_ids:
+        controllers.pop(base_device_id).async_shutdown()
+
+    phone_numbers = {entry.data[CONF_PHONE_NUMBER] for entry in active}
+    coordinators  = hass.data.get(DATA_COORDINATORS, {})
+    for phone_number in set(coordinators) - phone_numbers:
+        hass.async_create_task(coordinators.pop(phone_number).async_shutdown())
+
+    dispatchers = hass.data.get(DATA_DISPATCHERS, {})
+    for phone_number in set(dispatchers) - phone_numbers:
+        del dispatchers[phone_number]
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete data stored for a removed config entry's controller, unless another output's entry still uses it."""
+
+    base_device_id = parse_device_id(entry.data[CONF_DEVICE_ID])[0]
+    if any(
+        parse_device_id(other.data[CONF_DEVICE_ID])[0] == base_device_id
+        for other in hass.config_entries.async_entries(PALGATE_DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        return
+    await async_remove_roster(hass, base_device_id)
+    await async_remove_log(hass, base_device_id)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
@@ -141,6 +324,73 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry):
 # Service registration
 # ------------------------------------------------------------------
 
+async def _async_bulk_user_changes(
+    hass: HomeAssistant,
+    entity_id: str,
+    changes: list[tuple[str, str, dict | None]],
+    concurrency: int,
+    rate_limit: float,
+) -> dict:
+    """Apply user changes concurrently, then update the roster with the successful ones."""
+
+    api    = _get_api(hass, entity_id)
+    roster = _get_roster(hass, entity_id)
+
+    counts = Counter(phone for _, phone, _ in changes)
+    if duplicates := sorted(phone for phone, count in counts.items() if count > 1):
+        raise ServiceValidationError(f"Phone numbers listed more than once: {', '.join(duplicates)}")
+
+    results = await api.bulk_user_changes(changes, concurrency=concurrency, rate_limit=rate_limit)
+
+    written = []
+    for action, phone, _ in changes:
+        if not results[phone]["success"]:
+            continue
+        if action == "remove":
+            roster.async_delete(phone)
+        else:
+            written.append(phone)
+    if written:
+        await roster.async_refresh_users(written)
+
+    succeeded = sum(result["success"] for result in results.values())
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+
+async def _async_load_desired_users(hass: HomeAssistant, call: ServiceCall) -> list[dict]:
+    """Desired user list of a sync_users call, from its data or a file under /config."""
+
+    if "users" in call.data:
+        users = call.data["users"]
+    else:
+        path = hass.config.path(call.data["file"])
+        if not hass.config.is_allowed_path(path):
+            raise ServiceValidationError(f"Access to {path} is not allowed (see allowlist_external_dirs)")
+        try:
+            users = await hass.async_add_executor_job(load_user_file, path)
+        except HomeAssistantError as exc:
+            raise ServiceValidationError(str(exc)) from exc
+
+    counts = Counter(normalize_phone(user["phone"]) for user in users)
+    if duplicates := sorted(phone for phone, count in counts.items() if count > 1):
+        raise ServiceValidationError(f"Phone numbers listed more than once: {', '.join(duplicates)}")
+    return users
+
+
+def _service_priority(handler: Callable[[ServiceCall], Awaitable[Any]]) -> Callable[[ServiceCall], Awaitable[Any]]:
+    """Run a service handler's API requests in the service priority class."""
+
+    @functools.wraps(handler)
+    async def handle(call: ServiceCall) -> Any:
+        token = request_priority.set(PRIORITY_SERVICE)
+        try:
+            return await handler(call)
+        finally:
+            request_priority.reset(token)
+
+    return handle
+
+
 def _register_services(hass: HomeAssistant) -> None:
     """Register Palgate services. Safe to call multiple times."""
 
@@ -149,107 +399,229 @@ def _register_services(hass: HomeAssistant) -> None:
 
         api = _get_api(hass, call.data["entity_id"])
 
-        page      = await api.get_users_page(skip=0, limit=50)
-        total     = page.get("count", 0)
-        all_users = list(page.get("users", []))
-        skip      = len(all_users)
+        result = await api.get_all_users(
+            page_size=call.data["page_size"],
+            concurrency=call.data["concurrency"],
+        )
+        _get_roster(hass, call.data["entity_id"]).async_apply_users(result["users"])
+        return result
 
-        while skip < total:
-            page  = await api.get_users_page(skip=skip, limit=50)
-            batch = page.get("users", [])
-            if not batch:
-                break
-            all_users.extend(batch)
-            skip += len(batch)
+    async def handle_get_user_settings(call: ServiceCall) -> dict:
+        """Return the raw user record for a single user, from the local roster when known."""
 
-        return {"count": total, "users": all_users}
+        api    = _get_api(hass, call.data["entity_id"])
+        roster = _get_roster(hass, call.data["entity_id"])
 
-    async def handle_get_user_settings(call: ServiceCall) -> dict:
-        """Return the raw user record for a single user."""
+        if (user := roster.get(call.data["phone"])) is not None:
+            return user
 
-        api = _get_api(hass, call.data["entity_id"])
         try:
-            return await api.get_user(call.data["phone"])
+            user = await api.get_user(call.data["phone"])
         except HomeAssistantError as exc:
             raise ServiceValidationError(str(exc)) from exc
+        roster.async_upsert(call.data["phone"], user)
+        return user
 
     async def handle_add_user(call: ServiceCall) -> dict:
         """Add a new authorized user."""
 
         api = _get_api(hass, call.data["entity_id"])
         try:
-            return await api.add_user(
+            result = await api.add_user(
                 call.data["phone"],
                 settings=call.data.get("settings"),
             )
         except HomeAssistantError as exc:
             raise ServiceValidationError(str(exc)) from exc
+        await _get_roster(hass, call.data["entity_id"]).async_refresh_user(call.data["phone"])
+        return result
 
     async def handle_remove_user(call: ServiceCall) -> dict:
         """Remove an authorized user."""
 
         api = _get_api(hass, call.data["entity_id"])
         try:
-            return await api.remove_user(call.data["phone"])
+            result = await api.remove_user(call.data["phone"])
         except HomeAssistantError as exc:
             raise ServiceValidationError(str(exc)) from exc
+        _get_roster(hass, call.data["entity_id"]).async_delete(call.data["phone"])
+        return result
 
     async def handle_set_user_settings(call: ServiceCall) -> dict:
         """Update settings for an existing user."""
 
         api   = _get_api(hass, call.data["entity_id"])
         try:
-            return await api.set_user_settings(
+            result = await api.set_user_settings(
                 phone=call.data["phone"],
                 settings=call.data.get("settings"),
             )
         except HomeAssistantError as exc:
             raise ServiceValidationError(str(exc)) from exc
+        await _get_roster(hass, call.data["entity_id"]).async_refresh_user(call.data["phone"])
+        return result
 
     async def handle_get_device_log(call: ServiceCall) -> dict:
-        """Return the gate access log."""
+        """Return the gate access log from the local store, newest first."""
+
+        log = _get_log(hass, call.data["entity_id"])
+
+        if log.last_poll is None or time.monotonic() - log.last_poll > LOG_REFRESH_AGE:
+            try:
+                await log.async_poll()
+            except HomeAssistantError as exc:
+                if not len(log):
+                    raise ServiceValidationError(str(exc)) from exc
+                _LOGGER.warning("Serving stored access log, fetching new records failed: %s", exc)
+
+        since, until = _log_time_range(call)
+        records = log.query(since=since, until=until, user=call.data.get("user"), limit=call.data.get("limit"))
+        return {"count": len(records), "log": records}
+
+    async def handle_prepare_open(call: ServiceCall) -> dict:
+        """Warm up the connection and tokens for an imminent open."""
+
         api = _get_api(hass, call.data["entity_id"])
-        try:
-            return await api.get_device_log()
-        except HomeAssistantError as exc:
-            raise ServiceValidationError(str(exc)) from exc
+        return await api.prepare_open(hold=call.data["hold"])
+
+    async def handle_query_log_archive(call: ServiceCall) -> dict:
+        """Return archived access log records, newest first."""
+
+        archive = _get_entry_data(hass, call.data["entity_id"])[DATA_ARCHIVE]
+
+        since, until = _log_time_range(call)
+        records = await archive.async_query(
+            since=since, until=until, user=call.data.get("user"), limit=call.data["limit"]
+        )
+        return {"count": len(records), "log": records}
 
     hass.services.async_register(
         PALGATE_DOMAIN, SERVICE_GET_DEVICE_USERS,
-        handle_get_device_users,
+        _service_priority(handle_get_device_users),
         schema=_SVC_GET_DEVICE_USERS,
         supports_response=SupportsResponse.ONLY,
     )
     hass.services.async_register(
         PALGATE_DOMAIN, SERVICE_GET_USER_SETTINGS,
-        handle_get_user_settings,
+        _service_priority(handle_get_user_settings),
         schema=_SVC_GET_USER_SETTINGS,
         supports_response=SupportsResponse.ONLY,
     )
     hass.services.async_register(
         PALGATE_DOMAIN, SERVICE_ADD_USER,
-        handle_add_user,
+        _service_priority(handle_add_user),
         schema=_SVC_ADD_USER,
         supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
         PALGATE_DOMAIN, SERVICE_REMOVE_USER,
-        handle_remove_user,
+        _service_priority(handle_remove_user),
         schema=_SVC_REMOVE_USER,
         supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
         PALGATE_DOMAIN, SERVICE_SET_USER_SETTINGS,
-        handle_set_user_settings,
+        _service_priority(handle_set_user_settings),
         schema=_SVC_SET_USER_SETTINGS,
         supports_response=SupportsResponse.OPTIONAL,
     )
+
+    async def handle_search_users(call: ServiceCall) -> dict:
+        """Find users by phone or name prefix in the local roster."""
+
+        roster = _get_roster(hass, call.data["entity_id"])
+        users  = roster.search(call.data["query"], limit=call.data["limit"])
+        return {"count": len(users), "users": users}
+
+    hass.services.async_register(
+        PALGATE_DOMAIN, SERVICE_SEARCH_USERS,
+        _service_priority(handle_search_users),
+        schema=_SVC_SEARCH_USERS,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    def _bulk_handler(action: str):
+        async def handle_bulk(call: ServiceCall) -> dict:
+            """Apply one user change per record of call.data["users"]."""
+            return await _async_bulk_user_changes(
+                hass,
+                call.data["entity_id"],
+                [(action, user["phone"], user.get("settings")) for user in call.data["users"]],
+                concurrency=call.data["concurrency"],
+                rate_limit=call.data["rate_limit"],
+            )
+        return handle_bulk
+
+    for service, action in (
+        (SERVICE_BULK_ADD_USERS,         "add"),
+        (SERVICE_BULK_REMOVE_USERS,      "remove"),
+        (SERVICE_BULK_SET_USER_SETTINGS, "set"),
+    ):
+        hass.services.async_register(
+            PALGATE_DOMAIN, service,
+            _service_priority(_bulk_handler(action)),
+            schema=_SVC_BULK_USERS,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+    async def handle_sync_users(call: ServiceCall) -> dict:
+        """Make the gate's users match a desired list, changing only what differs."""
+
+        api     = _get_api(hass, call.data["entity_id"])
+        desired = await _async_load_desired_users(hass, call)
+
+        try:
+            current = (await api.get_all_users())["users"]
+        except HomeAssistantError as exc:
+            raise ServiceValidationError(str(exc)) from exc
+        _get_roster(hass, call.data["entity_id"]).async_apply_users(current)
+
+        changes, unchanged = compute_user_diff(
+            current, desired, call.data["remove_missing"], keep=(api.phone_number,)
+        )
+        response = {
+            "dry_run":   call.data["dry_run"],
+            "add":       {phone: settings for action, phone, settings in changes if action == "add"},
+            "update":    {phone: settings for action, phone, settings in changes if action == "set"},
+            "remove":    [phone for action, phone, _ in changes if action == "remove"],
+            "unchanged": unchanged,
+        }
+        if call.data["dry_run"] or not changes:
+            return response
+
+        return response | await _async_bulk_user_changes(
+            hass,
+            call.data["entity_id"],
+            changes,
+            concurrency=call.data["concurrency"],
+            rate_limit=call.data["rate_limit"],
+        )
+
+    hass.services.async_register(
+        PALGATE_DOMAIN, SERVICE_SYNC_USERS,
+        _service_priority(handle_sync_users),
+        schema=_SVC_SYNC_USERS,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
     hass.services.async_register(
         PALGATE_DOMAIN, SERVICE_GET_DEVICE_LOG,
-        handle_get_device_log,
+        _service_priority(handle_get_device_log),
         schema=_SVC_GET_DEVICE_LOG,
         supports_response=SupportsResponse.ONLY,
-)
+    )
+    hass.services.async_register(
+        PALGATE_DOMAIN, SERVICE_PREPARE_OPEN,
+        _service_priority(handle_prepare_open),
+        schema=_SVC_PREPARE_OPEN,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        PALGATE_DOMAIN, SERVICE_QUERY_LOG_ARCHIVE,
+        _service_priority(handle_query_log_archive),
+        schema=_SVC_QUERY_LOG_ARCHIVE,
+        supports_response=SupportsResponse.ONLY,
+    )
+
 
 def _unregister_services(hass: HomeAssistant) -> None:
     """Unregister all Palgate services."""
@@ -260,6 +632,13 @@ def _unregister_services(hass: HomeAssistant) -> None:
         SERVICE_REMOVE_USER,
         SERVICE_SET_USER_SETTINGS,
         SERVICE_GET_DEVICE_LOG,
+        SERVICE_SEARCH_USERS,
+        SERVICE_BULK_ADD_USERS,
+        SERVICE_BULK_REMOVE_USERS,
+        SERVICE_BULK_SET_USER_SETTINGS,
+        SERVICE_SYNC_USERS,
+        SERVICE_QUERY_LOG_ARCHIVE,
+        SERVICE_PREPARE_OPEN,
     ):
         hass.services.async_remove(PALGATE_DOMAIN, service)
 
@@ -294,4 +673,4 @@ async def _cleanup_orphaned_device(hass: HomeAssistant) -> None:
         _LOGGER.debug("Removing orphaned legacy 'palgate' device")
         device_registry.async_remove_device(old_device.id)
     else:
-        _LOGGER.debug(f"Legacy device still has entities: {[e.entity_id for e in entities]}")
\ No newline at end of file
+        _LOGGER.debug(f"Legacy device still has entities: {[e.entity_id for e in entities]}")
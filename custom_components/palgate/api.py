@@ -1,17 +1,23 @@
 """Palgate library."""
 
+import asyncio
+from collections import OrderedDict
 from http import HTTPStatus
 import json
-from typing import Any, Optional
-
-from datetime import datetime, timedelta
+import random
+import time
+from typing import Any, Callable, Optional
 
 import aiohttp
 from voluptuous.error import Error
 import logging
+from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util.ssl import get_default_context
 
-from .pylgate.token_generator import generate_token
+from .dispatcher import PalgateDispatcher, request_priority
+from .pylgate import backend as token_backend
+from .pylgate.token_generator import TokenGenerator
 from .const import *
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
@@ -26,6 +32,103 @@ RELAY_MODES_INVERSE: dict[tuple[bool, bool], str] = {
     v: k for k, v in RELAY_MODES.items()
 }
 
+# Requests that go ahead of everything else on the account's dispatcher
+INTERACTIVE_ENDPOINTS = frozenset({"open_gate", "invert_gate", "set_relay_mode"})
+
+# Without a native AES backend a token costs thousands of Python operations;
+# derive it in the executor rather than blocking the event loop.
+TOKEN_IN_EXECUTOR: bool = token_backend == "python"
+
+
+def create_command_session() -> aiohttp.ClientSession:
+    """Dedicated keep-alive pool for gate commands, apart from the shared HA session.
+
+    Uses Home Assistant's SSL context. The owner closes it - PalgateApiClient.async_close.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit_per_host=2,
+            keepalive_timeout=PREPARE_KEEPALIVE,
+            ttl_dns_cache=PREPARE_DNS_TTL,
+            ssl=get_default_context(),
+        )
+    )
+
+
+# Timed gate state transitions: state -> (timing attribute for its duration, next state)
+GATE_STATE_NEXT: dict[str, tuple[str, str]] = {
+    GATE_STATE_OPENING: ("seconds_to_open",  GATE_STATE_OPEN),
+    GATE_STATE_OPEN:    ("seconds_open",     GATE_STATE_CLOSING),
+    GATE_STATE_CLOSING: ("seconds_to_close", GATE_STATE_CLOSED),
+}
+
+
+class _TransientError(HomeAssistantError):
+    """Connection error, timeout or 5xx reply - safe to retry for idempotent calls."""
+
+
+def parse_device_id(device_id: str) -> tuple[str, int]:
+    """Return (base_device_id, output_num) of a device id with an optional ':N' output suffix."""
+    output_num = 1  # default
+
+    if ':' in device_id:
+        base_id, output = device_id.rsplit(':', 1)
+        if output.isdigit():
+            device_id = base_id
+            output_num = int(output)
+
+    return device_id, output_num
+
+
+class PalgateReadCache:
+    """Cached GET replies of one gate controller, shared by the API clients of its outputs.
+
+    A write through any of the clients invalidates the replies for all of
+    them, together with shared GETs still in flight that may predate it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+
+        self.entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.inflight: dict[str, asyncio.Future] = {}
+        self.generation: int = 0
+
+    def get(self, url: str, ttl: float) -> dict | None:
+        """Reply stored for url less than ttl seconds ago, if any."""
+
+        if cached := self.entries.get(url):
+            stored_at, reply = cached
+            if time.monotonic() - stored_at < ttl:
+                return reply
+        return None
+
+    def put(self, url: str, reply: dict, generation: int) -> None:
+        """Store a reply, unless it was requested before the last invalidation."""
+
+        if generation != self.generation:
+            return
+        self.entries[url] = (time.monotonic(), reply)
+        self.entries.move_to_end(url)
+        while len(self.entries) > CACHE_MAX_ENTRIES:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, url_prefix: str) -> None:
+        """Drop replies and in-flight GETs whose URL starts with url_prefix."""
+
+        self.generation += 1
+        for url in [url for url in self.entries if url.startswith(url_prefix)]:
+            del self.entries[url]
+        # Callers already waiting keep their result; later reads start a new GET
+        for url in [url for url in self.inflight if url.startswith(url_prefix)]:
+            del self.inflight[url]
+
+
+def get_device_read_cache(hass: HomeAssistant, base_device_id: str) -> PalgateReadCache:
+    """Return the read cache of a gate controller, shared by the entries of its outputs."""
+    return hass.data.setdefault(DATA_READ_CACHES, {}).setdefault(base_device_id, PalgateReadCache())
+
+
 class PalgateApiClient:
     """Main class for handling connection with."""
 
@@ -40,10 +143,26 @@ class PalgateApiClient:
         seconds_to_close: int,
         allow_invert_as_stop: bool,
         session: Optional[aiohttp.client.ClientSession] = None,
+        command_session: Optional[aiohttp.client.ClientSession] = None,
+        request_timeout: float = REQUEST_TIMEOUT,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        max_retries: int = REQUEST_RETRIES,
+        device_cache_ttl: float = DEVICE_CACHE_TTL,
+        user_cache_ttl: float = USER_CACHE_TTL,
+        dispatcher: PalgateDispatcher | None = None,
+        read_cache: PalgateReadCache | None = None,
     ) -> None:
         """Initialize connection with Palgate."""
 
         self._session = session
+        self._command_session = command_session
+        self._armed_until: float = 0.0                  # monotonic
+        self._keepalive_task: asyncio.Task | None = None
+        self.opens_collapsed: int = 0  # counted by the cover's open debounce
+        self.open_latency: dict[str, Any] = {
+            "count": 0, "last_ms": None, "min_ms": None, "max_ms": None, "last_warm": None,
+        }
+        self.dispatcher: PalgateDispatcher | None = dispatcher
         self.device_id: str = device_id
         self.token: str = token
         self.token_type: str = token_type
@@ -52,23 +171,43 @@ class PalgateApiClient:
         self.seconds_open: int = seconds_open
         self.seconds_to_close: int = seconds_to_close
         self.allow_invert_as_stop: bool = allow_invert_as_stop
-        self.next_open: datetime = datetime.now()
-        self.next_closing: datetime = datetime.now()
-        self.next_closed: datetime = datetime.now()
         self.relay_mode_permitted: bool = False  # updated by get_relay_mode()
+        self._listeners: list[Callable[[], None]] = []
+        self.gate_state: str = GATE_STATE_CLOSED
+        self._transition: asyncio.TimerHandle | None = None
+        self._state_listeners: list[Callable[[], None]] = []
+        self.max_retries: int = max_retries
+        self._timeout = aiohttp.ClientTimeout(total=request_timeout, connect=connect_timeout)
+        self.request_stats: dict[str, dict] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.requests_coalesced: int = 0
+        self.device_cache_ttl: float = device_cache_ttl
+        self.user_cache_ttl: float = user_cache_ttl
+        self.read_cache: PalgateReadCache = read_cache or PalgateReadCache()
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self._token_generator = TokenGenerator(
+            bytes.fromhex(token), int(phone_number), int(token_type)
+        )
+        self.token_stats: dict[str, Any] = {
+            "count":                0,
+            "loop_blocked_ms_last": 0.0,
+            "loop_blocked_ms_max":  0.0,
+            "loop_blocked_ms_total": 0.0,
+        }
 
     def _parsed_device_id(self) -> tuple[str, int]:
         """Return (base_device_id, output_num), parsing any ':N' suffix."""
-        device_id = self.device_id
-        output_num = 1  # default
+        return parse_device_id(self.device_id)
 
-        if ':' in device_id:
-            base_id, output = device_id.rsplit(':', 1)
-            if output.isdigit():
-                device_id = base_id
-                output_num = int(output)
+    @property
+    def base_device_id(self) -> str:
+        """Device id of the gate controller, without any output suffix."""
+        return self._parsed_device_id()[0]
 
-        return device_id, output_num
+    def _device_url(self) -> str:
+        """Build the device record URL, also the prefix of all per-device URLs."""
+        return f"{BASE_URL}/device/{self.base_device_id}"
 
     def _open_url(self) -> str:
         """Build the base open-gate URL."""
@@ -78,7 +217,30 @@ class PalgateApiClient:
             f"/open-gate?openBy=100&outputNum={output_num}"
         )
 
-    def _headers(self) -> dict:
+    async def _async_token(self) -> str:
+        """Derive the x-bt-token; cache misses run off the event loop on the pure-Python AES backend."""
+
+        timestamp = int(time.time())
+        start = time.perf_counter()
+        if (token := self._token_generator.cached_token(timestamp)) is not None:
+            blocked_ms = (time.perf_counter() - start) * 1000
+        elif TOKEN_IN_EXECUTOR:
+            token = await asyncio.get_running_loop().run_in_executor(
+                None, self._token_generator.token, timestamp
+            )
+            blocked_ms = 0.0
+        else:
+            token = self._token_generator.token(timestamp)
+            blocked_ms = (time.perf_counter() - start) * 1000
+
+        stats = self.token_stats
+        stats["count"] += 1
+        stats["loop_blocked_ms_last"]   = blocked_ms
+        stats["loop_blocked_ms_max"]    = max(stats["loop_blocked_ms_max"], blocked_ms)
+        stats["loop_blocked_ms_total"] += blocked_ms
+        return token
+
+    async def _async_headers(self) -> dict:
         """Get headers. Token generates dynamically as it includes a timestamp"""
 
         return {
@@ -88,116 +250,368 @@ class PalgateApiClient:
             "Connection": "keep-alive",
             "Content-Type": "application/json",
             "User-Agent": "BlueGate/115 CFNetwork/1128.0.1 Darwin/19.6.0",
-            "x-bt-token": f"{generate_token(bytes.fromhex(self.token),
-                            int(self.phone_number),
-                            int(self.token_type))}",
+            "x-bt-token": await self._async_token(),
         }
 
-    async def _api_request(self, url: str) -> dict:
-        """Execute a GET to any Palgate API URL, handle HTTP and API errors, return parsed JSON."""
-        async with self._session.get(url=url, headers=self._headers()) as resp:
-            _LOGGER.debug(f"API request. URL: {resp.url}")
-            if resp.status == HTTPStatus.UNAUTHORIZED:
-                raise HomeAssistantError(f"Unauthorized. {resp.status}")
-            if resp.status != HTTPStatus.OK:
-                raise HomeAssistantError(f"Not OK {resp.status} {await resp.text()}")
-            reply = await resp.json()
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        endpoint: str,
+        body: dict | None = None,
+        idempotent: bool = False,
+    ) -> dict:
+        """Execute any Palgate API call, handle HTTP and API errors, return parsed JSON.
+
+        Idempotent calls are retried with jittered exponential backoff on
+        connection errors, timeouts and 5xx replies. Gate commands never are.
+        Concurrent idempotent GETs of the same URL share one in-flight request.
+        """
+        if method != "GET" or not idempotent:
+            return await self._request_with_retries(method, url, endpoint, body, idempotent)
+
+        return await self._shared_get(self._inflight, url, endpoint)
+
+    async def _shared_get(self, inflight_by_url: dict[str, asyncio.Future], url: str, endpoint: str) -> dict:
+        """Idempotent GET, joining a request of the same URL already in inflight_by_url."""
+
+        if (inflight := inflight_by_url.get(url)) is None:
+            inflight = asyncio.ensure_future(
+                self._request_with_retries("GET", url, endpoint, None, True)
+            )
+            inflight_by_url[url] = inflight
+            inflight.add_done_callback(lambda fut: self._inflight_done(inflight_by_url, url, fut))
+        else:
+            self.requests_coalesced += 1
+            _LOGGER.debug(f"API GET {endpoint} joined in-flight request")
+
+        # Shielded, so one caller being cancelled doesn't cancel the others
+        return await asyncio.shield(inflight)
+
+    @staticmethod
+    def _inflight_done(inflight_by_url: dict[str, asyncio.Future], url: str, fut: asyncio.Future) -> None:
+        """Forget a finished shared request."""
+
+        if inflight_by_url.get(url) is fut:
+            del inflight_by_url[url]
+        if not fut.cancelled():
+            fut.exception()  # Retrieved here, in case every waiter was cancelled
+
+    async def _request_with_retries(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        body: dict | None,
+        idempotent: bool,
+    ) -> dict:
+        """Run a request, retrying transient failures of idempotent calls."""
+
+        attempts = 1 + (self.max_retries if idempotent else 0)
+        for attempt in range(attempts):
+            if attempt:
+                delay = RETRY_BACKOFF * 2 ** (attempt - 1)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            try:
+                reply = await self._request_once(method, url, endpoint, body)
+                break
+            except _TransientError as exc:
+                if attempt == attempts - 1:
+                    raise
+                _LOGGER.debug(f"API {method} {endpoint} failed, retrying: {exc}")
 
         _LOGGER.debug(f"API response: {reply}")
         if reply.get("err"):
             raise HomeAssistantError(f"API Request Error: {reply.get('msg') or reply.get('err')}")
-        
+
         return reply
 
-    async def _api_post(self, url: str, body: dict) -> dict:
-        """POST to a Palgate API URL with a JSON body."""
-        async with self._session.post(url=url, headers=self._headers(), json=body) as resp:
-            _LOGGER.debug(f"API POST {resp.url}")
-            if resp.status == HTTPStatus.UNAUTHORIZED:
-                raise HomeAssistantError(f"Unauthorized. {resp.status}")
-            if resp.status != HTTPStatus.OK:
-                raise HomeAssistantError(f"Not OK {resp.status} {await resp.text()}")
-            reply = await resp.json()
+    async def _request_once(
+        self, method: str, url: str, endpoint: str, body: dict | None
+    ) -> dict:
+        """Single HTTP round-trip, timed and counted per endpoint and status."""
+
+        if self.dispatcher:
+            await self.dispatcher.acquire(
+                PRIORITY_INTERACTIVE if endpoint in INTERACTIVE_ENDPOINTS else request_priority.get()
+            )
+
+        status: int | str = "error"
+        start = time.monotonic()
+        try:
+            session = self._get_command_session() if endpoint in INTERACTIVE_ENDPOINTS else self._session
+            async with session.request(
+                method,
+                url=url,
+                headers=await self._async_headers(),
+                json=body,
+                timeout=self._timeout,
+            ) as resp:
+                status = resp.status
+                _LOGGER.debug(f"API {method} {resp.url}")
+                if resp.status == HTTPStatus.UNAUTHORIZED:
+                    raise HomeAssistantError(f"Unauthorized. {resp.status}")
+                if resp.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                    raise _TransientError(f"Not OK {resp.status} {await resp.text()}")
+                if resp.status != HTTPStatus.OK:
+                    raise HomeAssistantError(f"Not OK {resp.status} {await resp.text()}")
+                return await resp.json()
+        except asyncio.TimeoutError as exc:
+            status = "timeout"
+            raise _TransientError(f"Timeout calling {endpoint}") from exc
+        except aiohttp.ClientConnectionError as exc:
+            raise _TransientError(f"Connection error calling {endpoint}: {exc}") from exc
+        except aiohttp.ClientError as exc:
+            raise HomeAssistantError(f"Error calling {endpoint}: {exc}") from exc
+        finally:
+            self._record_request(endpoint, status, time.monotonic() - start)
+
+    async def _cached_get(
+        self, url: str, *, endpoint: str, ttl: float, fresh: bool = False
+    ) -> dict:
+        """Idempotent GET served from the gate's read cache while younger than ttl seconds.
+
+        fresh skips the cache and any shared GET already in flight.
+        """
+        cache = self.read_cache
+        if ttl > 0 and not fresh and (reply := cache.get(url, ttl)) is not None:
+            self.cache_hits += 1
+            return reply
 
-        _LOGGER.debug(f"API response: {reply}")
-        if reply.get("err"):
-            raise HomeAssistantError(f"API Request Error: {reply.get('msg') or reply.get('err')}")
-        return reply
+        self.cache_misses += 1
+        generation = cache.generation
+        if fresh:
+            reply = await self._request_with_retries("GET", url, endpoint, None, True)
+        else:
+            reply = await self._shared_get(cache.inflight, url, endpoint)
 
-    async def _api_put(self, url: str, body: dict) -> dict:
-        """PUT to a Palgate API URL with a JSON body."""
-        async with self._session.put(url=url, headers=self._headers(), json=body) as resp:
-            _LOGGER.debug(f"API PUT {resp.url}")
-            if resp.status == HTTPStatus.UNAUTHORIZED:
-                raise HomeAssistantError(f"Unauthorized. {resp.status}")
-            if resp.status != HTTPStatus.OK:
-                raise HomeAssistantError(f"Not OK {resp.status} {await resp.text()}")
-            reply = await resp.json()
+        # Not stored if it may predate a write made while it was in flight
+        if ttl > 0:
+            cache.put(url, reply, generation)
 
-        _LOGGER.debug(f"API response: {reply}")
-        if reply.get("err"):
-            raise HomeAssistantError(f"API Request Error: {reply.get('msg') or reply.get('err')}")
         return reply
 
-    async def _api_delete(self, url: str) -> dict:
-        """DELETE a Palgate API URL."""
-        async with self._session.delete(url=url, headers=self._headers()) as resp:
-            _LOGGER.debug(f"API DELETE {resp.url}")
-            if resp.status == HTTPStatus.UNAUTHORIZED:
-                raise HomeAssistantError(f"Unauthorized. {resp.status}")
-            if resp.status != HTTPStatus.OK:
-                raise HomeAssistantError(f"Not OK {resp.status} {await resp.text()}")
-            reply = await resp.json()
+    def _invalidate_cache(self, url_prefix: str) -> None:
+        """Drop cached replies and in-flight GETs whose URL starts with url_prefix."""
+        self.read_cache.invalidate(url_prefix)
+
+    def _record_request(self, endpoint: str, status: int | str, seconds: float) -> None:
+        """Account one HTTP round-trip in request_stats."""
+
+        stats = self.request_stats.setdefault(endpoint, {
+            "count":            0,
+            "status":           {},
+            "latency_ms_last":  0.0,
+            "latency_ms_max":   0.0,
+            "latency_ms_total": 0.0,
+        })
+        latency_ms = seconds * 1000
+        stats["count"] += 1
+        stats["status"][str(status)] = stats["status"].get(str(status), 0) + 1
+        stats["latency_ms_last"]   = latency_ms
+        stats["latency_ms_max"]    = max(stats["latency_ms_max"], latency_ms)
+        stats["latency_ms_total"] += latency_ms
+
+    def diagnostics(self) -> dict:
+        """Runtime statistics for the diagnostics platform."""
 
-        _LOGGER.debug(f"API response: {reply}")
-        if reply.get("err"):
-            raise HomeAssistantError(f"API Request Error: {reply.get('msg') or reply.get('err')}")
-        return reply
+        return {
+            "token": {
+                "backend":     token_backend,
+                "in_executor": TOKEN_IN_EXECUTOR,
+                "cache":       self._token_generator.cache_info()._asdict(),
+                **self.token_stats,
+            },
+            "requests": self.request_stats,
+            "requests_coalesced": self.requests_coalesced,
+            "dispatcher": self.dispatcher.diagnostics() if self.dispatcher else None,
+            "open_latency": self.open_latency,
+            "opens_collapsed": self.opens_collapsed,
+            "armed": self.armed,
+            "cache": {
+                "hits":    self.cache_hits,
+                "misses":  self.cache_misses,
+                "entries": len(self.read_cache.entries),
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Armed open path
+    # ------------------------------------------------------------------
+
+    def _get_command_session(self) -> aiohttp.ClientSession:
+        """Command pool for gate commands and the connections prepare_open keeps warm."""
+        return self._command_session or self._session
+
+    @property
+    def armed(self) -> bool:
+        """A prepare_open is holding a warm connection."""
+        return time.monotonic() < self._armed_until
+
+    async def prepare_open(self, hold: float = PREPARE_HOLD) -> dict:
+        """Get ready for a fast open_gate within the next hold seconds.
+
+        Resolves DNS and opens a pooled TLS connection for commands, derives
+        the next few seconds' tokens, and keeps the connection warm until the
+        hold time passes.
+        """
+        start = time.monotonic()
+        self._armed_until = max(self._armed_until, start + hold)
+
+        warm = await self._async_warm_up()
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._async_keep_warm())
+
+        return {
+            "warm":        warm,
+            "prepared_ms": round((time.monotonic() - start) * 1000, 1),
+            "armed_for":   round(self._armed_until - time.monotonic(), 1),
+        }
+
+    async def _async_warm_up(self) -> bool:
+        """Connect the command session and derive upcoming tokens. Returns whether connecting worked."""
+
+        now = int(time.time())
+        timestamps = range(now, now + PREPARE_TOKEN_SECONDS)
+        if TOKEN_IN_EXECUTOR:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._token_generator.prefetch, timestamps
+            )
+        else:
+            self._token_generator.prefetch(timestamps)
+
+        try:
+            # Any reply will do - the pooled connection is what we are after
+            async with self._get_command_session().head(BASE_URL, timeout=self._timeout) as resp:
+                await resp.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            _LOGGER.debug(f"Warming up connection for {self.device_id} failed: {exc}")
+            return False
+        return True
+
+    async def _async_keep_warm(self) -> None:
+        while (remaining := self._armed_until - time.monotonic()) > 0:
+            await asyncio.sleep(min(PREPARE_PING_INTERVAL, remaining))
+            if self.armed:
+                await self._async_warm_up()
+
+    def _record_open_latency(self, latency_ms: float, warm: bool) -> None:
+        stats = self.open_latency
+        latency_ms = round(latency_ms, 1)
+        stats["count"]    += 1
+        stats["last_ms"]   = latency_ms
+        stats["min_ms"]    = latency_ms if stats["min_ms"] is None else min(stats["min_ms"], latency_ms)
+        stats["max_ms"]    = latency_ms if stats["max_ms"] is None else max(stats["max_ms"], latency_ms)
+        stats["last_warm"] = warm
+        _LOGGER.debug(f"Gate {self.device_id} open took {latency_ms} ms ({'warm' if warm else 'cold'})")
+
+    async def async_close(self) -> None:
+        """Stop keeping connections warm and the gate state machine, and close the command session."""
+
+        self._armed_until = 0.0
+        if self._transition:
+            self._transition.cancel()
+            self._transition = None
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+        if self._command_session:
+            await self._command_session.close()
+
+    def add_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener after each gate command we send. Returns a function removing it."""
+
+        self._listeners.append(listener)
+
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    def _notify_listeners(self) -> None:
+        for listener in list(self._listeners):
+            listener()
+
+    def add_state_listener(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Call listener on every gate state transition. Returns a function removing it."""
+
+        self._state_listeners.append(listener)
+
+        def remove_listener() -> None:
+            self._state_listeners.remove(listener)
+
+        return remove_listener
+
+    def _enter_state(self, state: str) -> None:
+        """Move the gate state machine to state and schedule the timed transition out of it."""
+
+        if self._transition:
+            self._transition.cancel()
+            self._transition = None
+
+        self.gate_state = state
+        if state in GATE_STATE_NEXT:
+            duration, next_state = GATE_STATE_NEXT[state]
+            # Scheduled on the event loop's monotonic clock
+            self._transition = asyncio.get_running_loop().call_later(
+                getattr(self, duration), self._enter_state, next_state
+            )
+
+        for listener in list(self._state_listeners):
+            listener()
 
     def is_opening(self) -> bool:
         """Current state of gate is opening."""
-        
-        return True if (self.next_open > datetime.now()) else False
+        return self.gate_state == GATE_STATE_OPENING
 
     def is_closing(self) -> bool:
         """Current state of gate is closing."""
-        
-        return True if (self.next_closed > datetime.now() and self.next_closing < datetime.now()) else False
+        return self.gate_state == GATE_STATE_CLOSING
 
     def is_closed(self) -> bool:
-        """Current state of gate is open."""
-
-        return False if (self.next_closed > datetime.now()) else True
+        """Current state of gate is closed."""
+        return self.gate_state == GATE_STATE_CLOSED
 
     async def open_gate(self) -> Any:
         """Open Palgate device."""
 
-        reply = await self._api_request(self._open_url())
-        self.next_open    = datetime.now() + timedelta(seconds=self.seconds_to_open)
-        self.next_closing = datetime.now() + timedelta(seconds=(self.seconds_to_open + self.seconds_open))
-        self.next_closed  = datetime.now() + timedelta(seconds=(self.seconds_to_open + self.seconds_open + self.seconds_to_close))
+        warm  = self.armed
+        start = time.monotonic()
+        reply = await self._request("GET", self._open_url(), endpoint="open_gate")
+        self._record_open_latency((time.monotonic() - start) * 1000, warm)
+        self._enter_state(GATE_STATE_OPENING)
+        self._notify_listeners()
         return reply
 
     async def invert_gate(self) -> Any:
         """Trigger the Palgate device again during open"""
 
         if self.allow_invert_as_stop and self.is_opening():
-            reply = await self._api_request(self._open_url())
-            self.next_open = self.next_closing = datetime.now()
-            self.next_closed  = datetime.now() + timedelta(seconds=self.seconds_to_close)  # Best guess
+            reply = await self._request("GET", self._open_url(), endpoint="invert_gate")
+            self._enter_state(GATE_STATE_CLOSING)
+            self._notify_listeners()
             return reply
 
-    async def get_device_data(self) -> dict:
-        """Fetch full device data from the API."""
-        device_id, _ = self._parsed_device_id()
-        url = f"{BASE_URL}/device/{device_id}"
-        data = await self._api_request(url)
+    async def get_device_data(self, fresh: bool = False) -> dict:
+        """Fetch full device data from the API. fresh bypasses the read cache."""
+        url = self._device_url()
+        data = await self._cached_get(
+            url, endpoint="get_device_data", ttl=self.device_cache_ttl, fresh=fresh
+        )
         return data.get("device", data)
-        
+
+    async def get_devices(self) -> list[dict]:
+        """Fetch the records of all gates the linked phone (account) is authorized for."""
+        url  = f"{BASE_URL}/devices"
+        data = await self._request("GET", url, endpoint="get_devices", idempotent=True)
+        return data.get("devices", [])
+
     async def get_relay_mode(self) -> str:
-        device_id, output_num = self._parsed_device_id()
+        return self.relay_mode_from_device(await self.get_device_data())
 
-        device = await self.get_device_data()
+    def relay_mode_from_device(self, device: dict) -> str:
+        """Extract this output's relay mode (and permission flag) from a device record."""
+        _, output_num = self._parsed_device_id()
 
         self.relay_mode_permitted = bool(device.get(f"output{output_num}Latch", False))
 
@@ -216,23 +630,81 @@ class PalgateApiClient:
             f"&output{output_num}Disabled={str(dsbl).lower()}"
         )
 
-        await self._api_request(url)
+        try:
+            await self._request("GET", url, endpoint="set_relay_mode")
+        finally:
+            self._invalidate_cache(self._device_url())
 
     # ------------------------------------------------------------------
     # User management
     # ------------------------------------------------------------------
 
-    async def get_users_page(self, skip: int = 0, limit: int = 50) -> dict:
-        """Fetch one page of authorized users. Returns raw response dict."""
+    async def get_users_page(self, skip: int = 0, limit: int = 50, fresh: bool = False) -> dict:
+        """Fetch one page of authorized users. Returns raw response dict. fresh bypasses the read cache."""
         device_id, _ = self._parsed_device_id()
         url = f"{BASE_URL}/device/{device_id}/users-v2?skip={skip}&limit={limit}"
-        return await self._api_request(url)
+        return await self._cached_get(url, endpoint="get_users_page", ttl=self.user_cache_ttl, fresh=fresh)
+
+    async def get_all_users(
+        self,
+        page_size: int = USERS_PAGE_SIZE,
+        concurrency: int = USERS_PAGE_CONCURRENCY,
+    ) -> dict:
+        """Fetch all authorized users, requesting pages concurrently.
+
+        The first page reports the total count, so the remaining offsets are
+        known up front. If the count changes mid-walk the list is re-read
+        sequentially. Returns {"count": int, "users": list}.
+        """
+        first = await self.get_users_page(skip=0, limit=page_size)
+        total = first.get("count", 0)
+        users = list(first.get("users", []))
+        step  = len(users)   # the API may cap the page size below what we asked for
+
+        if not step or step >= total:
+            return {"count": total, "users": users}
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(skip: int) -> dict:
+            async with semaphore:
+                return await self.get_users_page(skip=skip, limit=step)
+
+        pages = await asyncio.gather(*(fetch(skip) for skip in range(step, total, step)))
+        for page in pages:
+            users.extend(page.get("users", []))
+
+        if all(page.get("count", 0) == total for page in pages) and len(users) == total:
+            return {"count": total, "users": users}
+
+        _LOGGER.debug("User count changed while paging, re-reading sequentially")
+        return await self._get_all_users_sequential(page_size)
+
+    async def _get_all_users_sequential(self, page_size: int) -> dict:
+        """Fetch all authorized users one page after another, bypassing the read cache.
+
+        Only used when the cached or concurrent pages turned out inconsistent.
+        """
+        page      = await self.get_users_page(skip=0, limit=page_size, fresh=True)
+        total     = page.get("count", 0)
+        all_users = list(page.get("users", []))
+        skip      = len(all_users)
+
+        while skip < total:
+            page  = await self.get_users_page(skip=skip, limit=page_size, fresh=True)
+            batch = page.get("users", [])
+            if not batch:
+                break
+            all_users.extend(batch)
+            skip += len(batch)
+
+        return {"count": total, "users": all_users}
 
     async def get_user(self, phone: str) -> dict:
         """Fetch a single user by E.164 phone number. Returns raw user dict."""
         device_id, _ = self._parsed_device_id()
         url  = f"{BASE_URL}/device/{device_id}/user?pn={phone}"
-        data = await self._api_request(url)
+        data = await self._cached_get(url, endpoint="get_user", ttl=self.user_cache_ttl)
         user = data.get("user")
         if not user:
             raise HomeAssistantError(f"User {phone} not found on this device")
@@ -243,23 +715,71 @@ class PalgateApiClient:
         device_id, _ = self._parsed_device_id()
         url  = f"{BASE_URL}/device/{device_id}/user"
         body = {"id": phone, **(settings or {})}
-        return await self._api_post(url, body)
+        try:
+            return await self._request("POST", url, endpoint="add_user", body=body)
+        finally:
+            self._invalidate_cache(f"{self._device_url()}/user")
 
     async def remove_user(self, phone: str) -> dict:
         """Remove an authorized user by E.164 phone number."""
         device_id, _ = self._parsed_device_id()
         url = f"{BASE_URL}/device/{device_id}/user?pn={phone}"
-        return await self._api_delete(url)
+        try:
+            return await self._request("DELETE", url, endpoint="remove_user")
+        finally:
+            self._invalidate_cache(f"{self._device_url()}/user")
 
     async def set_user_settings(self, phone: str, settings: dict | None = None) -> dict:
         """Update settings for an existing user. phone is E.164 and serves as the user ID."""
         device_id, _ = self._parsed_device_id()
         url  = f"{BASE_URL}/device/{device_id}/user"
         body = {"id": phone, **(settings or {})}
-        return await self._api_put(url, body)
+        try:
+            return await self._request("PUT", url, endpoint="set_user_settings", body=body)
+        finally:
+            self._invalidate_cache(f"{self._device_url()}/user")
+
+    async def bulk_user_changes(
+        self,
+        changes: list[tuple[str, str, dict | None]],
+        concurrency: int = BULK_CONCURRENCY,
+        rate_limit: float = BULK_RATE_LIMIT,
+    ) -> dict[str, dict]:
+        """Apply many (action, phone, settings) user changes concurrently.
+
+        action is one of "add", "remove" or "set". At most concurrency
+        requests are in flight and request starts are spaced to rate_limit
+        per second (0 = unlimited). A failed change does not stop the others.
+        Returns phone -> {"success": True, "response": ...} or
+        {"success": False, "error": str}.
+        """
+        handlers = {
+            "add":    lambda phone, settings: self.add_user(phone, settings=settings),
+            "remove": lambda phone, settings: self.remove_user(phone),
+            "set":    lambda phone, settings: self.set_user_settings(phone, settings=settings),
+        }
+        semaphore  = asyncio.Semaphore(concurrency)
+        interval   = 1 / rate_limit if rate_limit else 0
+        next_start = time.monotonic()
+
+        async def apply(action: str, phone: str, settings: dict | None) -> dict:
+            nonlocal next_start
+            async with semaphore:
+                now        = time.monotonic()
+                delay      = next_start - now
+                next_start = max(next_start, now) + interval
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    return {"success": True, "response": await handlers[action](phone, settings)}
+                except HomeAssistantError as exc:
+                    return {"success": False, "error": str(exc)}
+
+        results = await asyncio.gather(*(apply(*change) for change in changes))
+        return {phone: result for (_, phone, _), result in zip(changes, results)}
 
     async def get_device_log(self) -> dict:
         """Fetch the gate access log for this device."""
         device_id, _ = self._parsed_device_id()
         url = f"{BASE_URL}/user/log?id={device_id}"
-        return await self._api_request(url)
\ No newline at end of file
+        return await self._request("GET", url, endpoint="get_device_log", idempotent=True)
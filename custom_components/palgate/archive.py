@@ -0,0 +1,166 @@
+"""Long-term access log archive: daily compressed segments with a sidecar index."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .roster import normalize_phone
+from .const import DOMAIN as PALGATE_DOMAIN
+from .const import *
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+INDEX_SUFFIX   = ".idx.json"
+
+
+def _segment_day(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
+
+
+class PalgateLogArchive:
+    """Access log records of one gate, kept for as long as the disk allows.
+
+    Records are appended to one gzip'd JSON-lines segment per UTC day under
+    <config>/palgate_archive/<device>/. Each segment has a small sidecar
+    index with its time range, record count and user ids, so queries only
+    decompress the segments that can match, and read them line by line.
+    """
+
+    def __init__(self, hass: HomeAssistant, device_id: str) -> None:
+        """Initialize."""
+
+        self.hass  = hass
+        self.path  = Path(hass.config.path(LOG_ARCHIVE_DIR, slugify(device_id)))
+        self._lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    @callback
+    def async_add_records(self, records: list[dict]) -> None:
+        """Archive new log records in the background."""
+
+        self.hass.async_create_background_task(
+            self.async_append(records), f"{PALGATE_DOMAIN} archive {self.path.name}"
+        )
+
+    async def async_append(self, records: list[dict]) -> None:
+        """Append records to their daily segments."""
+
+        async with self._lock:
+            try:
+                await self.hass.async_add_executor_job(self._append, records)
+            except OSError as exc:
+                _LOGGER.warning(f"Failed to archive {len(records)} log records to {self.path}: {exc}")
+
+    def _append(self, records: list[dict]) -> None:
+        days: dict[str, list[dict]] = {}
+        for record in records:
+            days.setdefault(_segment_day(record["time"]), []).append(record)
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        for day, day_records in days.items():
+            # Appending writes a new gzip member; readers see one continuous stream
+            with gzip.open(self.path / f"{day}{SEGMENT_SUFFIX}", "at", encoding="utf-8") as segment:
+                segment.writelines(json.dumps(record, separators=(",", ":")) + "\n" for record in day_records)
+
+            times = [record["time"] for record in day_records]
+            users = {normalize_phone(record["userId"]) for record in day_records if record.get("userId")}
+            if index := self._read_index(day):
+                times.extend((index["min_time"], index["max_time"]))
+                users.update(index["users"])
+            index = {
+                "min_time": min(times),
+                "max_time": max(times),
+                "count":    len(day_records) + (index["count"] if index else 0),
+                "users":    sorted(users),
+            }
+            temp = self.path / f"{day}{INDEX_SUFFIX}.tmp"
+            temp.write_text(json.dumps(index), encoding="utf-8")
+            os.replace(temp, self.path / f"{day}{INDEX_SUFFIX}")
+
+    def _read_index(self, day: str) -> dict | None:
+        try:
+            return json.loads((self.path / f"{day}{INDEX_SUFFIX}").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    async def async_seed(self, records: list[dict]) -> None:
+        """Archive records collected before this gate's archive existed."""
+
+        async with self._lock:
+            await self.hass.async_add_executor_job(self._seed, records)
+
+    def _seed(self, records: list[dict]) -> None:
+        if records and not self.path.is_dir():
+            self._append(records)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    async def async_query(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        user: str | None = None,
+        limit: int = ARCHIVE_QUERY_LIMIT,
+    ) -> list[dict]:
+        """Archived records within [since, until], optionally of one user, newest first."""
+
+        async with self._lock:
+            return await self.hass.async_add_executor_job(self._query, since, until, user, limit)
+
+    def _query(self, since: float | None, until: float | None, user: str | None, limit: int) -> list[dict]:
+        user = normalize_phone(user) if user else None
+
+        if not self.path.is_dir():
+            return []
+        days = sorted(
+            (name.name.removesuffix(SEGMENT_SUFFIX) for name in self.path.glob(f"*{SEGMENT_SUFFIX}")),
+            reverse=True,
+        )
+
+        result: list[dict] = []
+        for day in days:
+            index = self._read_index(day)
+            if index and (
+                (since is not None and index["max_time"] < since)
+                or (until is not None and index["min_time"] > until)
+                or (user and user not in index["users"])
+            ):
+                continue
+
+            # Segments are written in time order: the newest matches are the last ones
+            matches: deque[dict] = deque(maxlen=limit - len(result))
+            try:
+                with gzip.open(self.path / f"{day}{SEGMENT_SUFFIX}", "rt", encoding="utf-8") as segment:
+                    for line in segment:
+                        record = json.loads(line)
+                        if since is not None and record["time"] < since:
+                            continue
+                        if until is not None and record["time"] > until:
+                            continue
+                        if user and normalize_phone(record.get("userId", "")) != user:
+                            continue
+                        matches.append(record)
+            except (OSError, EOFError, ValueError) as exc:
+                _LOGGER.warning(f"Skipping unreadable archive segment {day} of {self.path.name}: {exc}")
+
+            result.extend(reversed(matches))
+            if len(result) >= limit:
+                break
+
+        return result
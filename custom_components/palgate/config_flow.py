@@ -21,7 +21,7 @@ from homeassistant.helpers.selector import selector
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.exceptions import HomeAssistantError 
 
-from .pylgate.token_generator import generate_token
+from .pylgate.token_generator import TokenGenerator
 from .const import DOMAIN as PALGATE_DOMAIN
 from .const import *
 
@@ -39,6 +39,7 @@ class PalgateFlowHandler(config_entries.ConfigFlow, domain=PALGATE_DOMAIN):
 
         self._task: asyncio.Task[None] | None = None
         self.linking_code: str = None
+        self._token_generator: TokenGenerator | None = None
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -166,8 +167,15 @@ class PalgateFlowHandler(config_entries.ConfigFlow, domain=PALGATE_DOMAIN):
 
         _session = async_get_clientsession(self.hass)
 
+        if self._token_generator is None:
+            self._token_generator = TokenGenerator(
+                bytes.fromhex(self._linked_token),
+                int(self._linked_phone_number),
+                int(self._linked_token_type),
+            )
+
         _headers = {
-            "x-bt-token": generate_token(bytes.fromhex(self._linked_token),int(self._linked_phone_number),int(self._linked_token_type))
+            "x-bt-token": self._token_generator.token()
         }
 
         async with _session.get(url=DEVICES_URL, headers=_headers) as resp:
@@ -344,6 +352,14 @@ class PalgateFlowHandler(config_entries.ConfigFlow, domain=PALGATE_DOMAIN):
             self.entry.data[CONF_ADVANCED][CONF_ALLOW_INVERT_AS_STOP] \
             if self.source == config_entries.SOURCE_RECONFIGURE \
             else False
+        def_open_debounce = \
+            self.entry.data[CONF_ADVANCED].get(CONF_OPEN_DEBOUNCE, OPEN_DEBOUNCE) \
+            if self.source == config_entries.SOURCE_RECONFIGURE \
+            else OPEN_DEBOUNCE
+        def_prepare_entity = \
+            self.entry.data[CONF_ADVANCED].get(CONF_PREPARE_OPEN_ENTITY) \
+            if self.source == config_entries.SOURCE_RECONFIGURE \
+            else None
 
 
         if self.source != config_entries.SOURCE_RECONFIGURE:
@@ -376,6 +392,14 @@ class PalgateFlowHandler(config_entries.ConfigFlow, domain=PALGATE_DOMAIN):
                             default=def_sec_to_close): int,
                         vol.Required(CONF_ALLOW_INVERT_AS_STOP, 
                             default=def_allow_invert): bool,
+                        vol.Required(CONF_OPEN_DEBOUNCE,
+                            default=def_open_debounce): vol.All(int, vol.Range(min=0, max=OPEN_DEBOUNCE_MAX)),
+                        vol.Optional(CONF_PREPARE_OPEN_ENTITY,
+                            description={"suggested_value": def_prepare_entity}): selector({
+                                "entity": {
+                                    "domain": ["binary_sensor", "device_tracker", "person", "input_boolean"],
+                                }
+                            }),
                     }
                 ),
                 {"collapsed": False \
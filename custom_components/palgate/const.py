@@ -12,29 +12,123 @@ CONF_SECONDS_TO_OPEN = "seconds_to_open"
 CONF_SECONDS_OPEN = "seconds_open"
 CONF_SECONDS_TO_CLOSE = "seconds_to_close"
 CONF_ALLOW_INVERT_AS_STOP = "allow_invert_as_stop"
+CONF_PREPARE_OPEN_ENTITY = "prepare_open_entity"
+CONF_OPEN_DEBOUNCE = "open_debounce"
 CONF_LINK_NEW_DEVICE = "Link New Device"
 
 GATE_MODE_NORMAL      = "normal"
 GATE_MODE_HOLD_OPEN   = "hold_open"
 GATE_MODE_HOLD_CLOSED = "hold_closed"
 
+# Gate states, driven by our own commands and the configured timings
+GATE_STATE_CLOSED     = "closed"
+GATE_STATE_OPENING    = "opening"
+GATE_STATE_OPEN       = "open"
+GATE_STATE_CLOSING    = "closing"
+
 SECONDS_TO_OPEN = 25
 SECONDS_OPEN = 45
 SECONDS_TO_CLOSE = 35
+OPEN_DEBOUNCE = 3   # sec, repeat opens within this window are collapsed into the first
+OPEN_DEBOUNCE_MAX = 60
 
-# Polling interval, applicable to SELECT platform only (disabled by default)
+# Polling interval of the shared account coordinator (cover attributes, relay mode)
 SCAN_INTERVAL = timedelta(minutes=1)
 
+# Adaptive account polling (sec) - accounts are spread over the interval, which is
+# stretched while nothing changes and tightened after a relay mode change or an open
+ACCOUNT_POLL_FAST           = 15
+ACCOUNT_POLL_MAX            = 600
+ACCOUNT_POLL_FAST_WINDOW    = 120
+ACCOUNT_POLL_STRETCH_AFTER  = 5     # unchanged polls before the interval doubles
+ACCOUNT_POLL_JITTER         = 0.1   # +/- fraction of the interval
+
 # API base URL
 BASE_URL = "https://api1.pal-es.com/v1/bt"
 
-# hass.data key for the shared API client per config entry
+# API request timeouts (sec) and retries, retries apply to idempotent reads only
+REQUEST_TIMEOUT = 15
+CONNECT_TIMEOUT = 5
+REQUEST_RETRIES = 2
+RETRY_BACKOFF   = 0.5   # first retry delay (sec), doubled per attempt, jittered
+
+# Account-wide request rate (per linked phone) and request priority classes
+DISPATCH_RATE           = 25    # requests per second
+DISPATCH_BURST          = 25
+PRIORITY_INTERACTIVE    = 0     # gate commands, relay mode changes
+PRIORITY_SERVICE        = 1     # palgate.* actions
+PRIORITY_BACKGROUND     = 2     # polling and syncs
+
+# Armed open path (palgate.prepare_open): dedicated keep-alive connection pool for gate
+# commands, kept warm with a cheap request every PREPARE_PING_INTERVAL while armed (sec)
+PREPARE_HOLD            = 60
+PREPARE_PING_INTERVAL   = 15
+PREPARE_KEEPALIVE       = 30    # idle pooled connection lifetime
+PREPARE_DNS_TTL         = 300
+PREPARE_TOKEN_SECONDS   = 20    # upcoming per-second tokens derived ahead, past the next ping
+
+# API read cache TTLs (sec, 0 disables) - invalidated by our own writes
+DEVICE_CACHE_TTL  = 10
+USER_CACHE_TTL    = 30
+CACHE_MAX_ENTRIES = 256
+
+# User list paging (palgate.get_device_users)
+USERS_PAGE_SIZE         = 50
+USERS_PAGE_CONCURRENCY  = 4
+
+# Bulk user changes (palgate.bulk_* services)
+BULK_CONCURRENCY        = 8
+BULK_RATE_LIMIT         = 25    # requests started per second, 0 = unlimited
+
+# Local user roster (persisted in .storage, resynced with the API periodically)
+ROSTER_STORAGE_VERSION  = 1
+ROSTER_SAVE_DELAY       = 10    # sec
+ROSTER_SYNC_INTERVAL    = timedelta(minutes=15)
+
+# Local access log (persisted in .storage, fetched incrementally)
+LOG_STORAGE_VERSION     = 1
+LOG_SAVE_DELAY          = 30    # sec
+LOG_MAX_RECORDS         = 5000
+LOG_REFRESH_AGE         = 60    # sec, palgate.get_device_log polls first when older
+
+# Adaptive log polling (sec) - fast after an opening, backing off exponentially when idle
+LOG_POLL_FAST           = 5
+LOG_POLL_MAX            = 300
+LOG_POLL_FAST_WINDOW    = 60    # after new records, and after the gate closed
+
+# palgate_access events, not fired for records older than this (sec), e.g. on first sync
+EVENT_PALGATE_ACCESS    = "palgate_access"
+LOG_EVENT_MAX_AGE       = 900
+
+# Long-term access log archive under the config directory
+LOG_ARCHIVE_DIR         = "palgate_archive"
+ARCHIVE_QUERY_LIMIT     = 1000
+
+# hass.data keys for the API client and shared account coordinator per config entry
 DATA_API = "api"
+DATA_COORDINATOR = "coordinator"
+DATA_ROSTER = "roster"
+DATA_LOG = "log"
+DATA_ARCHIVE = "archive"
+DATA_LOG_POLLER = "log_poller"
+
+# hass.data keys for resources shared between entries: per gate controller, per linked phone
+DATA_READ_CACHES = f"{DOMAIN}_read_caches"
+DATA_CONTROLLERS = f"{DOMAIN}_controllers"
+DATA_COORDINATORS = f"{DOMAIN}_coordinators"
+DATA_DISPATCHERS = f"{DOMAIN}_dispatchers"
 
 # Service names
-SERVICE_GET_DEVICE_USERS     = "get_device_users"
-SERVICE_GET_USER_SETTINGS    = "get_user_settings"
-SERVICE_ADD_USER             = "add_user"
-SERVICE_REMOVE_USER          = "remove_user"
-SERVICE_SET_USER_SETTINGS    = "set_user_settings"
-SERVICE_GET_DEVICE_LOG       = "get_device_log"
\ No newline at end of file
+SERVICE_GET_DEVICE_USERS       = "get_device_users"
+SERVICE_GET_USER_SETTINGS      = "get_user_settings"
+SERVICE_ADD_USER               = "add_user"
+SERVICE_REMOVE_USER            = "remove_user"
+SERVICE_SET_USER_SETTINGS      = "set_user_settings"
+SERVICE_GET_DEVICE_LOG         = "get_device_log"
+SERVICE_SEARCH_USERS           = "search_users"
+SERVICE_BULK_ADD_USERS         = "bulk_add_users"
+SERVICE_BULK_REMOVE_USERS      = "bulk_remove_users"
+SERVICE_BULK_SET_USER_SETTINGS = "bulk_set_user_settings"
+SERVICE_SYNC_USERS             = "sync_users"
+SERVICE_QUERY_LOG_ARCHIVE      = "query_log_archive"
+SERVICE_PREPARE_OPEN           = "prepare_open"
@@ -0,0 +1,119 @@
+"""User roster and access log of a gate controller, shared by the entries of its outputs."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_time_interval
+
+from .api import PalgateApiClient
+from .archive import PalgateLogArchive
+from .events import async_setup_access_events
+from .log import PalgateLogCollector, PalgateLogPoller
+from .roster import PalgateUserRoster
+from .const import DOMAIN as PALGATE_DOMAIN
+from .const import *
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+class PalgateController:
+    """Roster, log collector, log poller and log archive of one gate controller.
+
+    A controller with several outputs is set up as one config entry per
+    output, all reading the same users and the same access log. They share
+    one instance, registered per base device id in hass.data[DATA_CONTROLLERS],
+    so the log is polled and archived and the users are synced only once,
+    and every access record fires a single palgate_access event.
+    Requests go through the API client of any loaded entry of the
+    controller; _prune_shared shuts it down once the last one is unloaded.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: PalgateApiClient) -> None:
+        """Initialize."""
+
+        self.hass           = hass
+        self.base_device_id = api.base_device_id
+        self.roster         = PalgateUserRoster(hass, api, self.base_device_id)
+        self.log            = PalgateLogCollector(hass, api, self.base_device_id)
+        self.log_poller     = PalgateLogPoller(hass, self.log)
+        self.archive        = PalgateLogArchive(hass, self.base_device_id)
+        self._apis: list[PalgateApiClient] = []
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self.setup: asyncio.Task | None = None
+
+    async def async_setup(self) -> None:
+        """Restore the stored roster and log, then keep them up to date, archived and evented."""
+
+        await self.roster.async_load()
+        await self.log.async_load()
+
+        # Long-term archive - every new log record is appended to it
+        self._unsubs.append(self.log.async_add_listener(self.archive.async_add_records))
+        self.hass.async_create_background_task(
+            self.archive.async_seed(self.log.query()[::-1]), f"{PALGATE_DOMAIN} archive seed {self.base_device_id}"
+        )
+
+        # ... and fired as a palgate_access event
+        self._unsubs.append(
+            async_setup_access_events(self.hass, self.base_device_id, self.log, self.roster)
+        )
+
+        self.hass.async_create_background_task(
+            self._async_sync_roster(), f"{PALGATE_DOMAIN} roster sync {self.base_device_id}"
+        )
+        self._unsubs.append(
+            async_track_time_interval(self.hass, self._async_sync_roster, ROSTER_SYNC_INTERVAL)
+        )
+
+        # Poll the log fast after openings, backing off when the gate is idle
+        self.log_poller.async_start()
+        self._unsubs.append(self.log_poller.async_stop)
+
+    async def _async_sync_roster(self, *_: Any) -> None:
+        try:
+            await self.roster.async_sync()
+        except HomeAssistantError as exc:
+            _LOGGER.warning("Failed to sync users of %s: %s", self.base_device_id, exc)
+
+    @callback
+    def async_add_api(self, api: PalgateApiClient) -> Callable[[], None]:
+        """Make api available for the controller's requests. Returns a function removing it."""
+
+        self._apis.append(api)
+
+        @callback
+        def remove_api() -> None:
+            self._apis.remove(api)
+            # Entries of the other outputs may stay loaded: move on to one of their clients
+            if self._apis and api in (self.roster.api, self.log.api):
+                self.roster.api = self.log.api = self._apis[0]
+
+        return remove_api
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop syncing and polling."""
+
+        while self._unsubs:
+            self._unsubs.pop()()
+
+
+async def async_get_controller(hass: HomeAssistant, api: PalgateApiClient) -> PalgateController:
+    """Return the shared data of api's gate controller, creating it on first use.
+
+    Registered before its stored data is loaded, so entries of outputs of
+    the same controller set up concurrently share it and wait for the load
+    together.
+    """
+    controllers = hass.data.setdefault(DATA_CONTROLLERS, {})
+    if (controller := controllers.get(api.base_device_id)) is None:
+        controller = controllers[api.base_device_id] = PalgateController(hass, api)
+        controller.setup = hass.async_create_task(controller.async_setup())
+
+    await asyncio.shield(controller.setup)
+    return controller
@@ -0,0 +1,190 @@
+"""Data update coordinator for Palgate."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+import random
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import PalgateApiClient
+from .const import DOMAIN as PALGATE_DOMAIN
+from .const import *
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+class PalgateAccountCoordinator(DataUpdateCoordinator[dict[str, dict]]):
+    """Refresh every gate of a linked phone (account) with one /devices call per interval.
+
+    All config entries linked through the same phone number share one
+    coordinator, registered per phone in hass.data[DATA_COORDINATORS]. Its
+    data maps base device id -> device record.
+
+    The interval adapts: the coordinators of all accounts are given evenly
+    spaced, jittered slots within SCAN_INTERVAL so they don't poll in the
+    same second; it doubles every ACCOUNT_POLL_STRETCH_AFTER polls without
+    changes (up to ACCOUNT_POLL_MAX), and drops to ACCOUNT_POLL_FAST for a
+    while after a relay mode change or an open.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: PalgateApiClient) -> None:
+        """Initialize."""
+
+        self.api = api                  # until an entry of the account is loaded
+        self.phone_number = api.phone_number
+
+        # Not tied to the entry being set up, whose unload would shut it down for all of
+        # them - _prune_shared shuts it down once the account's last entry is unloaded
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=None,
+            name=f"{PALGATE_DOMAIN} {self.phone_number}",
+            update_interval=SCAN_INTERVAL,
+        )
+
+        self.unchanged_polls: int = 0
+        self._fast_until: float = 0.0                   # monotonic
+        self.next_poll: datetime | None = None
+        self._unsub_fast: CALLBACK_TYPE | None = None
+        self.first_refresh: asyncio.Task | None = None
+
+    def _account_apis(self) -> list[PalgateApiClient]:
+        """API clients of all loaded entries linked through this account.
+
+        Looked up on every refresh, as entries are unloaded and reloaded
+        while the coordinator lives on.
+        """
+        apis = [
+            entry_data[DATA_API]
+            for entry_data in self.hass.data.get(PALGATE_DOMAIN, {}).values()
+            if entry_data[DATA_API].phone_number == self.phone_number
+        ]
+        return apis or [self.api]
+
+    def device(self, base_device_id: str) -> dict | None:
+        """Latest record of one gate controller, if known."""
+
+        return (self.data or {}).get(base_device_id)
+
+    async def _async_update_data(self) -> dict[str, dict]:
+        """Fetch all device records of the account."""
+
+        apis = self._account_apis()
+        try:
+            devices = {
+                device["id"]: device
+                for device in await apis[0].get_devices()
+                if "id" in device
+            }
+
+            # A configured gate missing from the account listing is fetched on its own
+            for api in apis:
+                if api.base_device_id not in devices:
+                    devices[api.base_device_id] = await api.get_device_data(fresh=True)
+
+        except HomeAssistantError as exc:
+            raise UpdateFailed(str(exc)) from exc
+
+        self.unchanged_polls = self.unchanged_polls + 1 if devices == self.data else 0
+        self._set_next_interval()
+        return devices
+
+    # ------------------------------------------------------------------
+    # Adaptive scheduling
+    # ------------------------------------------------------------------
+
+    def _slot(self) -> tuple[int, int]:
+        """(index, count) of this account among all polled accounts."""
+
+        phones = sorted(set(self.hass.data.get(DATA_COORDINATORS, {})) | {self.phone_number})
+        return phones.index(self.phone_number), len(phones)
+
+    @callback
+    def _set_next_interval(self) -> None:
+        """Pick the delay until the next refresh (applied when this one completes)."""
+
+        if time.monotonic() < self._fast_until:
+            interval = ACCOUNT_POLL_FAST
+            delay    = interval
+        else:
+            stretch  = 2 ** (self.unchanged_polls // ACCOUNT_POLL_STRETCH_AFTER)
+            interval = min(SCAN_INTERVAL.total_seconds() * stretch, ACCOUNT_POLL_MAX)
+            # Next start of this account's slot within the interval
+            index, count = self._slot()
+            offset = interval * index / count
+            delay  = interval - (time.time() - offset) % interval
+            if delay < interval / 2:
+                delay += interval
+
+        delay *= 1 + random.uniform(-ACCOUNT_POLL_JITTER, ACCOUNT_POLL_JITTER)
+        self.update_interval = timedelta(seconds=delay)
+        self.next_poll       = dt_util.utcnow() + self.update_interval
+
+    @callback
+    def async_tighten(self) -> None:
+        """Poll fast for a while, e.g. after a relay mode change or an open."""
+
+        self.unchanged_polls = 0
+        self._fast_until     = time.monotonic() + ACCOUNT_POLL_FAST_WINDOW
+
+        if self._unsub_fast or (
+            self.next_poll and self.next_poll <= dt_util.utcnow() + timedelta(seconds=ACCOUNT_POLL_FAST)
+        ):
+            return
+
+        @callback
+        def _refresh_soon(_now) -> None:
+            self._unsub_fast = None
+            self.hass.async_create_task(self.async_request_refresh())
+
+        self._unsub_fast = async_call_later(
+            self.hass, ACCOUNT_POLL_FAST, HassJob(_refresh_soon, cancel_on_shutdown=True)
+        )
+        self.next_poll   = dt_util.utcnow() + timedelta(seconds=ACCOUNT_POLL_FAST)
+
+    async def async_shutdown(self) -> None:
+        """Stop refreshing, including a pending fast poll."""
+
+        if self._unsub_fast:
+            self._unsub_fast()
+            self._unsub_fast = None
+        await super().async_shutdown()
+
+    def diagnostics(self) -> dict:
+        """Polling state for the diagnostics platform."""
+
+        return {
+            "phone_slot":      "{}/{}".format(*self._slot()),
+            "interval":        self.update_interval.total_seconds() if self.update_interval else None,
+            "next_poll":       self.next_poll.isoformat() if self.next_poll else None,
+            "unchanged_polls": self.unchanged_polls,
+            "fast":            time.monotonic() < self._fast_until,
+        }
+
+
+async def async_get_account_coordinator(
+    hass: HomeAssistant, api: PalgateApiClient
+) -> PalgateAccountCoordinator:
+    """Return the coordinator of api's linked phone, creating it on first use.
+
+    Registered before its first refresh, so entries of the same phone set up
+    concurrently share it and wait for that refresh together. One that was
+    shut down is replaced.
+    """
+    coordinators = hass.data.setdefault(DATA_COORDINATORS, {})
+    coordinator  = coordinators.get(api.phone_number)
+    if coordinator is None or coordinator._shutdown_requested:
+        coordinator = coordinators[api.phone_number] = PalgateAccountCoordinator(hass, api)
+        coordinator.first_refresh = hass.async_create_task(coordinator.async_refresh())
+
+    await asyncio.shield(coordinator.first_refresh)
+    return coordinator
@@ -1,5 +1,7 @@
 """Sensor file for Palgate."""
 
+import asyncio
+import time
 from typing import Any, Optional
 
 from homeassistant.components.cover import (
@@ -14,10 +16,12 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.exceptions import ServiceValidationError
 import logging
 
 from .api import PalgateApiClient
+from .coordinator import PalgateAccountCoordinator
 from .const import DOMAIN as PALGATE_DOMAIN
 from .const import *
 
@@ -42,25 +46,40 @@ async def async_setup_entry(
     )
 
     api = hass.data[PALGATE_DOMAIN][entry.entry_id][DATA_API]
-        
+    coordinator = hass.data[PALGATE_DOMAIN][entry.entry_id][DATA_COORDINATOR]
+
     async_add_entities(
-        PalgateCover(api, description, device_id) for description in COVERS
+        PalgateCover(
+            coordinator,
+            api,
+            description,
+            device_id,
+            open_debounce=entry.data[CONF_ADVANCED].get(CONF_OPEN_DEBOUNCE, OPEN_DEBOUNCE),
+        )
+        for description in COVERS
     )
 
 
-class PalgateCover(CoverEntity):
+class PalgateCover(CoordinatorEntity[PalgateAccountCoordinator], CoverEntity):
     """Define a Palgate entity."""
 
     def __init__(
         self,
+        coordinator: PalgateAccountCoordinator,
         api: PalgateApiClient,
         description: CoverEntityDescription,
         device_id: str,
+        open_debounce: float = OPEN_DEBOUNCE,
     ) -> None:
         """Initialize."""
 
+        super().__init__(coordinator)
         self.api = api
         self.entity_description = description
+        self._open_debounce = open_debounce
+        self._open_task: asyncio.Task | None = None
+        self._open_started: float = 0.0            # monotonic
+        self._optimistic_opening: bool = False
 
         self._attr_unique_id = f"{description.key}"
         self._attr_device_info = DeviceInfo(
@@ -70,20 +89,15 @@ class PalgateCover(CoverEntity):
             model="Gate Controller",
         )
 
-        self._address: str | None = None
-        self._address_coord: tuple[str, str] | None = None
-        self._sim_status: str | None = None
-        self._sim_valid_until: str | None = None
-        self._model: str | None = None
-        self._isadmin: bool | None = None
-        self._name1: str | None = None
-        self._customname1: str | None = None
-        self._customname2: str | None = None
+    async def async_added_to_hass(self) -> None:
+        """Write state exactly at each gate state transition."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.api.add_state_listener(self.async_write_ha_state))
 
     @property
     def is_opening(self) -> Optional[bool]:
         """Return if the cover is opening or not."""
-        return self.api.is_opening()
+        return self._optimistic_opening or self.api.is_opening()
 
     @property
     def is_closing(self) -> Optional[bool]:
@@ -93,48 +107,71 @@ class PalgateCover(CoverEntity):
     @property
     def is_closed(self) -> Optional[bool]:
         """Return if the cover is closed or not."""
-        return self.api.is_closed()
+        return not self._optimistic_opening and self.api.is_closed()
+
+    @property
+    def available(self) -> bool:
+        """Gate commands don't depend on the device record being fetched."""
+        return True
 
     @property
     def extra_state_attributes(self) -> dict:
+        """Device info, refreshed by the shared account coordinator."""
+        device = self.coordinator.device(self.api.base_device_id) or {}
         return {
-            "address":         self._address,
-            "sim_status":      self._sim_status,
-            "sim_valid_until": self._sim_valid_until,
-            "model":           self._model,
-            "isadmin":         self._isadmin,
-            "address_coord":   self._address_coord,
-            "name1":           self._name1,
-            "customname1":     self._customname1,
-            "customname2":     self._customname2,
+            "address":         device.get("address"),
+            "sim_status":      device.get("simStatus"),
+            "sim_valid_until": device.get("validUntil"),
+            "model":           device.get("model"),
+            "isadmin":         device.get("admin"),
+            "address_coord":   device.get("addressCoord"),
+            "name1":           device.get("name1"),
+            "customname1":     device.get("customName1"),
+            "customname2":     device.get("customName2"),
+            "last_open_latency_ms": self.api.open_latency["last_ms"],
         }
 
-    async def async_added_to_hass(self) -> None:
-        """Fetch device info once on startup."""
-        try:
-            device = await self.api.get_device_data()
-            self._address         = device.get("address")
-            self._sim_status      = device.get("simStatus")
-            self._sim_valid_until = device.get("validUntil")
-            self._model           = device.get("model")
-            self._address_coord   = device.get("addressCoord")
-            self._isadmin         = device.get("admin")
-            self._name1           = device.get("name1")
-            self._customname1     = device.get("customName1")
-            self._customname2     = device.get("customName2")
-            self.async_write_ha_state()
-        except Exception as exc:
-            _LOGGER.warning("Failed to fetch device info: %s", exc)
-
     async def async_open_cover(self, **kwargs: Any) -> None:
-        """Open the cover."""
+        """Open the cover.
+
+        Repeat opens while one is in flight, or within the debounce window
+        after it started and succeeded, share that open's request and result.
+        A retry after a failed open sends a new one.
+        """
+
+        task = self._open_task
+        if task and (
+            not task.done()
+            or (
+                not task.cancelled()
+                and task.exception() is None
+                and time.monotonic() - self._open_started < self._open_debounce
+            )
+        ):
+            self.api.opens_collapsed += 1
+            _LOGGER.debug(f"Gate {self.api.device_id} open collapsed into the previous one")
+        else:
+            # Before the task: it starts eagerly and may finish (and clear the flag) right away
+            self._optimistic_opening = True
+            self.async_write_ha_state()
+            self._open_started = time.monotonic()
+            self._open_task    = self.hass.async_create_task(self._async_open_gate())
 
         try:
-            await self.api.open_gate()
+            await asyncio.shield(self._open_task)
         except Exception as exc:
             _LOGGER.warning("Gate operation failed. %s", exc)
             raise ServiceValidationError(str(exc)) from exc
 
+    async def _async_open_gate(self) -> Any:
+        """Send the open command; the gate state machine takes over on success."""
+
+        try:
+            return await self.api.open_gate()
+        finally:
+            self._optimistic_opening = False
+            self.async_write_ha_state()
+
     async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop the cover - only if allowed in config (usually auto-close)"""
 
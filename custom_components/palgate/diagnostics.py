@@ -0,0 +1,33 @@
+"""Diagnostics support for Palgate."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN as PALGATE_DOMAIN
+from .const import *
+
+TO_REDACT = {CONF_TOKEN, CONF_PHONE_NUMBER}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+
+    entry_data = hass.data[PALGATE_DOMAIN][entry.entry_id]
+
+    return {
+        "entry":   async_redact_data(entry.as_dict(), TO_REDACT),
+        "api":     entry_data[DATA_API].diagnostics(),
+        "polling": entry_data[DATA_COORDINATOR].diagnostics(),
+        "log":     {
+            "records":       len(entry_data[DATA_LOG]),
+            "poll_interval": entry_data[DATA_LOG_POLLER].interval,
+        },
+    }
@@ -0,0 +1,113 @@
+"""Account-wide request rate limiting with priority classes."""
+
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+import heapq
+import itertools
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import *
+
+# Priority of the API requests made in the current context (service call, task)
+request_priority: ContextVar[int] = ContextVar(
+    "palgate_request_priority", default=PRIORITY_BACKGROUND
+)
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_SERVICE:     "service",
+    PRIORITY_BACKGROUND:  "background",
+}
+
+
+class PalgateDispatcher:
+    """Token bucket shared by all API clients of one linked phone (account).
+
+    Requests take one token each; tokens refill at rate per second up to
+    burst. Waiting requests are released by priority class, then in
+    arrival order. Interactive requests (gate commands) never wait: they
+    take their token even if that overdraws the bucket, which then delays
+    the other classes instead.
+    """
+
+    def __init__(self, rate: float = DISPATCH_RATE, burst: int = DISPATCH_BURST) -> None:
+        """Initialize."""
+
+        self.rate   = rate
+        self.burst  = burst
+        self._tokens: float = burst
+        self._updated: float = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._wakeup: asyncio.TimerHandle | None = None
+        self.stats: dict[str, dict] = {
+            name: {"count": 0, "waited": 0, "wait_ms_max": 0.0} for name in PRIORITY_NAMES.values()
+        }
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens  = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority: int) -> None:
+        """Wait for a request slot of the given priority class."""
+
+        stats = self.stats[PRIORITY_NAMES[priority]]
+        stats["count"] += 1
+        self._refill()
+
+        if priority == PRIORITY_INTERACTIVE or (not self._waiters and self._tokens >= 1):
+            self._tokens -= 1
+            return
+
+        start  = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), waiter))
+        self._schedule_release()
+        await waiter
+
+        waited_ms = (time.monotonic() - start) * 1000
+        stats["waited"] += 1
+        stats["wait_ms_max"] = max(stats["wait_ms_max"], round(waited_ms, 1))
+
+    def _schedule_release(self) -> None:
+        if self._wakeup is None and self._waiters:
+            delay = max(0.0, (1 - self._tokens) / self.rate)
+            self._wakeup = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Hand available tokens to the highest priority waiters."""
+
+        self._wakeup = None
+        self._refill()
+        while self._waiters and self._tokens >= 1:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():   # cancelled while queued
+                continue
+            self._tokens -= 1
+            waiter.set_result(None)
+        self._schedule_release()
+
+    def diagnostics(self) -> dict:
+        """Bucket state and per-class counters for the diagnostics platform."""
+
+        self._refill()
+        return {
+            "rate":    self.rate,
+            "tokens":  round(self._tokens, 2),
+            "queued":  sum(not waiter.done() for _, _, waiter in self._waiters),
+            "classes": self.stats,
+        }
+
+
+def get_account_dispatcher(hass: HomeAssistant, phone_number: str) -> PalgateDispatcher:
+    """Return the dispatcher of a linked phone, shared with its other entries.
+
+    Registered synchronously, so entries of the same phone set up concurrently
+    get the same one.
+    """
+    return hass.data.setdefault(DATA_DISPATCHERS, {}).setdefault(phone_number, PalgateDispatcher())
@@ -0,0 +1,58 @@
+"""palgate_access events fired for new access log records."""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .log import PalgateLogCollector
+from .roster import PalgateUserRoster, normalize_phone
+from .const import *
+
+
+@callback
+def async_setup_access_events(
+    hass: HomeAssistant,
+    device_id: str,
+    log: PalgateLogCollector,
+    roster: PalgateUserRoster,
+) -> Callable[[], None]:
+    """Fire a palgate_access event for every new log record of a gate.
+
+    The collector only hands over records past its persisted cursor, so
+    nothing is fired twice across restarts. Records older than
+    LOG_EVENT_MAX_AGE (e.g. the history fetched on first sync) are not
+    fired. Returns a function removing the listener.
+    """
+
+    @callback
+    def _fire_events(records: list[dict]) -> None:
+        cutoff = time.time() - LOG_EVENT_MAX_AGE
+
+        for record in records:
+            if record["time"] < cutoff:
+                continue
+
+            user_id = normalize_phone(record.get("userId") or "")
+            user    = {**(roster.get(user_id) or {}), **record} if user_id else record
+            name    = " ".join(
+                str(part) for part in (user.get("firstname"), user.get("lastname")) if part
+            )
+
+            hass.bus.async_fire(
+                EVENT_PALGATE_ACCESS,
+                {
+                    "device_id": device_id,
+                    "user_id":   user_id or None,
+                    "name":      name or None,
+                    "time":      dt_util.utc_from_timestamp(record["time"]).isoformat(),
+                    "type":      record.get("type"),
+                    "reason":    record.get("reason"),
+                    "record":    record,
+                },
+            )
+
+    return log.async_add_listener(_fire_events)
@@ -0,0 +1,244 @@
+"""Incremental, persisted collector of a gate's access log, and its adaptive poller."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+import json
+import logging
+import time
+from typing import Any, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .api import PalgateApiClient
+from .roster import normalize_phone
+from .const import DOMAIN as PALGATE_DOMAIN
+from .const import *
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+async def async_remove_log(hass: HomeAssistant, base_device_id: str) -> None:
+    """Delete the stored access log of a gate controller."""
+    await Store(hass, LOG_STORAGE_VERSION, f"{PALGATE_DOMAIN}.log.{base_device_id}").async_remove()
+
+
+def _record_key(record: dict) -> str:
+    """Identity of a log record; several records can share one timestamp."""
+    return json.dumps(record, sort_keys=True)
+
+
+def _record_time(record: dict) -> float:
+    return record["time"]
+
+
+class PalgateLogCollector:
+    """Access log of one gate, fetched incrementally and kept locally.
+
+    The API has no cursor of its own and always returns its full log, so
+    we remember the newest timestamp already stored (plus the records at
+    that second) and only keep what is newer. Records are held oldest
+    first, capped at LOG_MAX_RECORDS, and persisted in Home Assistant's
+    storage.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: PalgateApiClient, base_device_id: str) -> None:
+        """Initialize."""
+
+        self.api = api
+        self._store: Store[dict[str, Any]] = Store(
+            hass, LOG_STORAGE_VERSION, f"{PALGATE_DOMAIN}.log.{base_device_id}"
+        )
+        self._records: list[dict] = []
+        self._cursor: float | None = None      # newest stored timestamp
+        self._cursor_keys: set[str] = set()     # records stored at that timestamp
+        self.last_poll: float | None = None     # monotonic
+        self._listeners: list[Callable[[list[dict]], None]] = []
+
+    async def async_load(self) -> None:
+        """Restore the records saved by a previous run."""
+
+        if data := await self._store.async_load():
+            self._records = data.get("records", [])
+            self._reset_cursor()
+
+    def _reset_cursor(self) -> None:
+        if not self._records:
+            self._cursor, self._cursor_keys = None, set()
+            return
+        self._cursor      = self._records[-1]["time"]
+        self._cursor_keys = {
+            _record_key(record)
+            for record in self._records[bisect_left(self._records, self._cursor, key=_record_time):]
+        }
+
+    async def async_poll(self) -> list[dict]:
+        """Fetch the log and store the records not seen before. Returns them, oldest first."""
+
+        data = await self.api.get_device_log()
+        self.last_poll = time.monotonic()
+
+        fresh = sorted(
+            (
+                record for record in data.get("log", [])
+                if isinstance(record.get("time"), (int, float))
+                and (self._cursor is None or record["time"] >= self._cursor)
+            ),
+            key=_record_time,
+        )
+        new = [
+            record for record in fresh
+            if record["time"] != self._cursor or _record_key(record) not in self._cursor_keys
+        ]
+        if not new:
+            return []
+
+        self._records.extend(new)
+        if (excess := len(self._records) - LOG_MAX_RECORDS) > 0:
+            del self._records[:excess]
+        self._reset_cursor()
+
+        _LOGGER.debug(f"Log of {self.api.device_id}: {len(new)} new records")
+        self._store.async_delay_save(lambda: {"records": self._records}, LOG_SAVE_DELAY)
+        for listener in list(self._listeners):
+            listener(new)
+        return new
+
+    @callback
+    def async_add_listener(self, listener: Callable[[list[dict]], None]) -> Callable[[], None]:
+        """Call listener with each batch of new records. Returns a function removing it."""
+
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    def query(
+        self,
+        since: float | None = None,
+        until: float | None = None,
+        user: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Stored records within [since, until], optionally of one user, newest first."""
+
+        start = 0 if since is None else bisect_left(self._records, since, key=_record_time)
+        end   = len(self._records) if until is None else bisect_right(self._records, until, key=_record_time)
+        user  = normalize_phone(user) if user else None
+
+        result = []
+        for index in range(end - 1, start - 1, -1):
+            record = self._records[index]
+            if user and normalize_phone(record.get("userId", "")) != user:
+                continue
+            result.append(record)
+            if limit and len(result) >= limit:
+                break
+        return result
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class PalgateLogPoller:
+    """Poll a log collector adaptively instead of on a fixed interval.
+
+    Polls every LOG_POLL_FAST seconds while the gate is likely to produce
+    records (while a tracked gate's state machine has it opening, open or
+    closing, and for LOG_POLL_FAST_WINDOW after it closed or new records
+    showed up), then doubles the interval on every idle poll up to
+    LOG_POLL_MAX.
+    """
+
+    def __init__(self, hass: HomeAssistant, log: PalgateLogCollector) -> None:
+        """Initialize."""
+
+        self.hass = hass
+        self.log  = log
+        self.interval: float = LOG_POLL_FAST
+        self._fast_until: float = 0.0                   # monotonic
+        self._moving: set[PalgateApiClient] = set()     # gates not closed
+        self.next_poll: float | None = None             # monotonic
+        self._polling: bool = False
+        self._running: bool = False
+        self._unsub: CALLBACK_TYPE | None = None
+        self._job = HassJob(self._async_poll, f"{PALGATE_DOMAIN} log poll {log.api.device_id}")
+
+    @callback
+    def async_start(self) -> None:
+        """Poll right away, then keep polling."""
+        self._running = True
+        self._schedule(0)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop polling."""
+
+        self._running = False
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        self.next_poll = None
+
+    @callback
+    def async_boost(self, seconds: float = LOG_POLL_FAST_WINDOW) -> None:
+        """Poll fast for the next seconds."""
+
+        self._fast_until = max(self._fast_until, time.monotonic() + seconds)
+        self.interval    = LOG_POLL_FAST
+        # A running poll schedules the next one itself when done
+        if self._running and not self._polling and (self.next_poll is None or self.next_poll > time.monotonic() + LOG_POLL_FAST):
+            self._schedule(LOG_POLL_FAST)
+
+    @callback
+    def async_track_gate(self, api: PalgateApiClient) -> Callable[[], None]:
+        """Poll fast while api's gate is not closed. Returns a function stopping it."""
+
+        @callback
+        def _gate_state_changed() -> None:
+            if api.is_closed():
+                self._moving.discard(api)
+            else:
+                self._moving.add(api)
+            self.async_boost()
+
+        remove_listener = api.add_state_listener(_gate_state_changed)
+
+        @callback
+        def untrack() -> None:
+            remove_listener()
+            self._moving.discard(api)
+
+        return untrack
+
+    @callback
+    def _schedule(self, delay: float) -> None:
+        if self._unsub:
+            self._unsub()
+        self.next_poll = time.monotonic() + delay
+        self._unsub    = async_call_later(self.hass, delay, self._job)
+
+    async def _async_poll(self, _now: Any = None) -> None:
+        self._unsub   = None
+        self._polling = True
+        try:
+            if await self.log.async_poll():
+                self._fast_until = max(self._fast_until, time.monotonic() + LOG_POLL_FAST_WINDOW)
+        except HomeAssistantError as exc:
+            _LOGGER.debug(f"Log poll of {self.log.api.device_id} failed: {exc}")
+        finally:
+            self._polling = False
+
+        if not self._running:
+            return
+        if self._moving or time.monotonic() < self._fast_until:
+            self.interval = LOG_POLL_FAST
+        else:
+            self.interval = min(self.interval * 2, LOG_POLL_MAX)
+        self._schedule(self.interval)
@@ -1 +1,2 @@
-from .token_generator import generate_token
+from ._backend import BACKEND as backend
+from .token_generator import generate_token, generate_tokens_batch, TokenGenerator
@@ -0,0 +1,94 @@
+"""
+Command line interface: `python -m pylgate {token,bench}`
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from . import benchmark
+from ._backend import BACKEND
+from .token_generator import generate_token
+from .types import TokenType
+
+
+def _token(args: argparse.Namespace) -> int:
+    print(generate_token(bytes.fromhex(args.session_token),
+                         args.phone_number,
+                         TokenType(args.token_type),
+                         timestamp_ms=args.timestamp))
+    return 0
+
+
+def _bench(args: argparse.Namespace) -> int:
+    results = benchmark.run_benchmarks(args.duration)
+    speeds = benchmark.relative_speeds(results)
+
+    print(f"backend: {BACKEND}")
+    print(f"{'case':<28}{'ops/sec':>12}{'x ref':>10}{'p50 us':>10}{'p90 us':>10}{'p99 us':>10}")
+    for name, result in results.items():
+        print(f"{name:<28}{result.ops_per_sec:>12.0f}{speeds.get(name, 1.0):>10.3f}"
+              f"{result.p50_us:>10.2f}{result.p90_us:>10.2f}{result.p99_us:>10.2f}")
+
+    if args.save_baseline:
+        benchmark.save_baseline(results, args.baseline)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if args.check:
+        baseline = benchmark.load_baseline(args.baseline)
+        if not baseline:
+            print(f"no baseline for backend {BACKEND} in {args.baseline}", file=sys.stderr)
+            return 2
+        regressions = benchmark.find_regressions(results, baseline, args.tolerance)
+        for name, (measured, expected) in regressions.items():
+            print(f"REGRESSION {name}: {measured:.3f} x reference, baseline {expected:.3f}", file=sys.stderr)
+        return 1 if regressions else 0
+
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="pylgate", description="PalGate derived token tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    token = subparsers.add_parser("token", help="generate a derived token")
+    token.add_argument("session_token", help="session token as hex string")
+    token.add_argument("phone_number", type=int, help="phone number in international format")
+    token.add_argument("token_type", type=int, choices=[t.value for t in TokenType],
+                       help="0 = SMS, 1 = primary linked device, 2 = secondary linked device")
+    token.add_argument("--timestamp", type=int, default=None,
+                       help="time in seconds since Epoch, defaults to now")
+    token.set_defaults(func=_token)
+
+    bench = subparsers.add_parser("bench", help="run the token generator benchmarks")
+    bench.add_argument("--duration", type=float, default=benchmark.DEFAULT_DURATION,
+                       help="seconds to run each case")
+    bench.add_argument("--baseline", type=Path, default=benchmark.BASELINE_PATH,
+                       help="baseline file")
+    bench.add_argument("--check", action="store_true",
+                       help="exit with status 1 if any case is slower than the baseline allows")
+    bench.add_argument("--tolerance", type=float, default=benchmark.DEFAULT_TOLERANCE,
+                       help="allowed slowdown relative to the baseline, as a fraction")
+    bench.add_argument("--save-baseline", action="store_true",
+                       help="store these results as the baseline of the current backend")
+    bench.set_defaults(func=_bench)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,117 +19,151 @@ Warning:
     user. Changes to this module are not considered breaking changes and may not be documented in
     the changelog.
 """
-import ctypes
+from operator import itemgetter
+
+from ._constants import (
+    S_BOX,
+    RCON,
+    INVERSE_S_BOX,
+    XTIME,
+    MUL_3,
+    MUL_9,
+    MUL_11,
+    MUL_13,
+    MUL_14,
+    SHIFT_ROWS,
+    INV_SHIFT_ROWS,
+    BLOCK_SIZE,
+    KEY_SIZE,
+)
+
+ROUNDS = 10
+
+_shift_rows = itemgetter(*SHIFT_ROWS)
+_inv_shift_rows = itemgetter(*INV_SHIFT_ROWS)
+
+
+def _build_tables() -> tuple[tuple[tuple[int, ...], ...], tuple[tuple[int, ...], ...]]:
+    """Build the four encryption and four decryption T-tables (32-bit words, big-endian columns)"""
+    te0 = []
+    td0 = []
+    for i in range(256):
+        s = S_BOX[i]
+        te0.append((XTIME[s] << 24) | (s << 16) | (s << 8) | MUL_3[s])
+
+        s = INVERSE_S_BOX[i]
+        td0.append((MUL_14[s] << 24) | (MUL_9[s] << 16) | (MUL_13[s] << 8) | MUL_11[s])
+
+    def _rotations(table: list[int]) -> tuple[tuple[int, ...], ...]:
+        return tuple(
+            tuple(((w >> (8 * n)) | (w << (32 - 8 * n))) & 0xffffffff for w in table)
+            for n in range(4)
+        )
+
+    return _rotations(te0), _rotations(td0)
+
+
+(_TE0, _TE1, _TE2, _TE3), (_TD0, _TD1, _TD2, _TD3) = _build_tables()
+
+
+def expand_encrypt_key(key: bytes) -> tuple[int, ...]:
+    """Expand a 16 bytes key into the 44 round key words used by `encrypt_block`"""
+    if len(key) != KEY_SIZE:
+        raise ValueError("Key is not 16 bytes")
+
+    words = [int.from_bytes(key[i:i + 4], "big") for i in range(0, KEY_SIZE, 4)]
+    for rnd in range(ROUNDS):
+        t = words[-1]
+        t = (
+            (S_BOX[(t >> 16) & 0xff] << 24)
+            | (S_BOX[(t >> 8) & 0xff] << 16)
+            | (S_BOX[t & 0xff] << 8)
+            | S_BOX[t >> 24]
+        ) ^ (RCON[rnd] << 24)
+        for _ in range(4):
+            t ^= words[-4]
+            words.append(t)
+
+    return tuple(words)
+
+
+def expand_decrypt_key(key: bytes) -> tuple[int, ...]:
+    """Expand a 16 bytes key into the 44 round key words used by `decrypt_block`
+
+    Round keys are stored in reverse order, with InvMixColumns pre-applied to the inner rounds
+    (the "equivalent inverse cipher" of FIPS-197 section 5.3.5)
+    """
+    enc = expand_encrypt_key(key)
+    words = list(enc[40:44])
+    for rnd in range(ROUNDS - 1, 0, -1):
+        for w in enc[4 * rnd:4 * rnd + 4]:
+            words.append(
+                _TD0[S_BOX[w >> 24]]
+                ^ _TD1[S_BOX[(w >> 16) & 0xff]]
+                ^ _TD2[S_BOX[(w >> 8) & 0xff]]
+                ^ _TD3[S_BOX[w & 0xff]]
+            )
+    words.extend(enc[0:4])
+
+    return tuple(words)
+
+
+def encrypt_block(block: bytes, round_keys: tuple[int, ...]) -> bytes:
+    """Encrypt a single 16 bytes block with keys from `expand_encrypt_key`"""
+    te0, te1, te2, te3 = _TE0, _TE1, _TE2, _TE3
+    rk = round_keys
+
+    s0 = int.from_bytes(block[0:4], "big") ^ rk[0]
+    s1 = int.from_bytes(block[4:8], "big") ^ rk[1]
+    s2 = int.from_bytes(block[8:12], "big") ^ rk[2]
+    s3 = int.from_bytes(block[12:16], "big") ^ rk[3]
+
+    for k in range(4, 4 * ROUNDS, 4):
+        s0, s1, s2, s3 = (
+            te0[s0 >> 24] ^ te1[(s1 >> 16) & 0xff] ^ te2[(s2 >> 8) & 0xff] ^ te3[s3 & 0xff] ^ rk[k],
+            te0[s1 >> 24] ^ te1[(s2 >> 16) & 0xff] ^ te2[(s3 >> 8) & 0xff] ^ te3[s0 & 0xff] ^ rk[k + 1],
+            te0[s2 >> 24] ^ te1[(s3 >> 16) & 0xff] ^ te2[(s0 >> 8) & 0xff] ^ te3[s1 & 0xff] ^ rk[k + 2],
+            te0[s3 >> 24] ^ te1[(s0 >> 16) & 0xff] ^ te2[(s1 >> 8) & 0xff] ^ te3[s2 & 0xff] ^ rk[k + 3],
+        )
+
+    # Last round: ShiftRows and SubBytes on the whole state, then AddRoundKey as one 128-bit XOR
+    state = bytes(_shift_rows(((s0 << 96) | (s1 << 64) | (s2 << 32) | s3).to_bytes(BLOCK_SIZE, "big")))
+    last_key = (rk[40] << 96) | (rk[41] << 64) | (rk[42] << 32) | rk[43]
+
+    return (int.from_bytes(state.translate(S_BOX), "big") ^ last_key).to_bytes(BLOCK_SIZE, "big")
 
-from ._constants import S_BOX, RCON, INVERSE_S_BOX, BLOCK_SIZE, KEY_SIZE
-from ._utils import galois_mul2, bytes_to_uint8, uint8_to_bytes
+
+def decrypt_block(block: bytes, round_keys: tuple[int, ...]) -> bytes:
+    """Decrypt a single 16 bytes block with keys from `expand_decrypt_key`"""
+    td0, td1, td2, td3 = _TD0, _TD1, _TD2, _TD3
+    rk = round_keys
+
+    s0 = int.from_bytes(block[0:4], "big") ^ rk[0]
+    s1 = int.from_bytes(block[4:8], "big") ^ rk[1]
+    s2 = int.from_bytes(block[8:12], "big") ^ rk[2]
+    s3 = int.from_bytes(block[12:16], "big") ^ rk[3]
+
+    for k in range(4, 4 * ROUNDS, 4):
+        s0, s1, s2, s3 = (
+            td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xff] ^ td2[(s2 >> 8) & 0xff] ^ td3[s1 & 0xff] ^ rk[k],
+            td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xff] ^ td2[(s3 >> 8) & 0xff] ^ td3[s2 & 0xff] ^ rk[k + 1],
+            td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xff] ^ td2[(s0 >> 8) & 0xff] ^ td3[s3 & 0xff] ^ rk[k + 2],
+            td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xff] ^ td2[(s1 >> 8) & 0xff] ^ td3[s0 & 0xff] ^ rk[k + 3],
+        )
+
+    state = bytes(_inv_shift_rows(((s0 << 96) | (s1 << 64) | (s2 << 32) | s3).to_bytes(BLOCK_SIZE, "big")))
+    last_key = (rk[40] << 96) | (rk[41] << 64) | (rk[42] << 32) | rk[43]
+
+    return (int.from_bytes(state.translate(INVERSE_S_BOX), "big") ^ last_key).to_bytes(BLOCK_SIZE, "big")
 
 
 def aes_encrypt_decrypt(state: bytes, key: bytes, *, is_encrypt: bool) -> bytes:
+    # NOTE: the flag keeps the naming of the original implementation, which is inverted relative to
+    # FIPS-197: `is_encrypt=True` runs the AES inverse cipher, `is_encrypt=False` the forward cipher.
     if len(state) != BLOCK_SIZE or len(key) != KEY_SIZE:
         raise ValueError("State and/or key are not 16 bytes")
 
-    state_array = bytes_to_uint8(state)
-    key_array = bytes_to_uint8(key)
-    _aes_enc_dec(state_array, key_array, is_encrypt)
-
-    return uint8_to_bytes(state_array)
-
-
-def _aes_enc_dec(state: [ctypes.c_uint8], key: [ctypes.c_uint8], encrypt: bool) -> None:
-    if encrypt:
-        for rnd in range(10):
-            key[0] = ctypes.c_uint8(S_BOX[key[13].value] ^ key[0].value ^ RCON[rnd])
-            key[1] = ctypes.c_uint8(S_BOX[key[14].value] ^ key[1].value)
-            key[2] = ctypes.c_uint8(S_BOX[key[15].value] ^ key[2].value)
-            key[3] = ctypes.c_uint8(S_BOX[key[12].value] ^ key[3].value)
-            for i in range(4, KEY_SIZE):
-                key[i] = ctypes.c_uint8(key[i].value ^ key[i - 4].value)
-
-        for i in range(BLOCK_SIZE):
-            state[i] = ctypes.c_uint8(state[i].value ^ key[i].value)
-
-    for rnd in range(10):
-        if encrypt:
-            for i in range(KEY_SIZE - 1, 3, -1):
-                key[i] = ctypes.c_uint8(key[i].value ^ key[i - 4].value)
-            key[0] = ctypes.c_uint8(S_BOX[key[13].value] ^ key[0].value ^ RCON[9 - rnd])
-            key[1] = ctypes.c_uint8(S_BOX[key[14].value] ^ key[1].value)
-            key[2] = ctypes.c_uint8(S_BOX[key[15].value] ^ key[2].value)
-            key[3] = ctypes.c_uint8(S_BOX[key[12].value] ^ key[3].value)
-        else:
-            for i in range(BLOCK_SIZE):
-                state[i] = ctypes.c_uint8(S_BOX[state[i].value ^ key[i].value])
-
-            buf1 = state[1].value
-            state[1].value = state[5].value
-            state[5].value = state[9].value
-            state[9].value = state[13].value
-            state[13].value = buf1
-
-            buf1, buf2 = state[2].value, state[6].value
-            state[2].value = state[10].value
-            state[6].value = state[14].value
-            state[10].value = buf1
-            state[14].value = buf2
-
-            buf1 = state[15].value
-            state[15].value = state[11].value
-            state[11].value = state[7].value
-            state[7].value = state[3].value
-            state[3].value = buf1
-
-        if (rnd > 0 and encrypt) or (rnd < 9 and not encrypt):
-            for i in range(4):
-                buf4 = i << 2
-                if encrypt:
-                    buf1 = galois_mul2(galois_mul2(ctypes.c_uint8(state[buf4].value ^ state[buf4 + 2].value))).value
-                    buf2 = galois_mul2(galois_mul2(ctypes.c_uint8(state[buf4 + 1].value ^ state[buf4 + 3].value))).value
-                    state[buf4].value ^= buf1
-                    state[buf4 + 1].value ^= buf2
-                    state[buf4 + 2].value ^= buf1
-                    state[buf4 + 3].value ^= buf2
-
-                buf1 = state[buf4].value ^ state[buf4 + 1].value ^ state[buf4 + 2].value ^ state[buf4 + 3].value
-                buf2 = state[buf4].value
-                buf3 = galois_mul2(ctypes.c_uint8(state[buf4].value ^ state[buf4 + 1].value)).value
-                state[buf4].value = state[buf4].value ^ buf3 ^ buf1
-                buf3 = galois_mul2(ctypes.c_uint8(state[buf4 + 1].value ^ state[buf4 + 2].value)).value
-                state[buf4 + 1].value = state[buf4 + 1].value ^ buf3 ^ buf1
-                buf3 = galois_mul2(ctypes.c_uint8(state[buf4 + 2].value ^ state[buf4 + 3].value)).value
-                state[buf4 + 2].value = state[buf4 + 2].value ^ buf3 ^ buf1
-                buf3 = galois_mul2(ctypes.c_uint8(state[buf4 + 3].value ^ buf2)).value
-                state[buf4 + 3].value = state[buf4 + 3].value ^ buf3 ^ buf1
-
-        if encrypt:
-            buf1 = state[13].value
-            state[13].value = state[9].value
-            state[9].value = state[5].value
-            state[5].value = state[1].value
-            state[1].value = buf1
-
-            buf1, buf2 = state[10].value, state[14].value
-            state[10].value = state[2].value
-            state[14].value = state[6].value
-            state[2].value = buf1
-            state[6].value = buf2
-
-            buf1 = state[3].value
-            state[3].value = state[7].value
-            state[7].value = state[11].value
-            state[11].value = state[15].value
-            state[15].value = buf1
-
-            for i in range(BLOCK_SIZE):
-                state[i] = ctypes.c_uint8(INVERSE_S_BOX[state[i].value] ^ key[i].value)
-        else:
-            key[0] = ctypes.c_uint8(S_BOX[key[13].value] ^ key[0].value ^ RCON[rnd])
-            key[1] = ctypes.c_uint8(S_BOX[key[14].value] ^ key[1].value)
-            key[2] = ctypes.c_uint8(S_BOX[key[15].value] ^ key[2].value)
-            key[3] = ctypes.c_uint8(S_BOX[key[12].value] ^ key[3].value)
-            for i in range(4, KEY_SIZE):
-                key[i] = ctypes.c_uint8(key[i].value ^ key[i - 4].value)
-
-    if not encrypt:
-        for i in range(BLOCK_SIZE):
-            state[i] = ctypes.c_uint8(state[i].value ^ key[i].value)
+    if is_encrypt:
+        return decrypt_block(state, expand_decrypt_key(key))
+
+    return encrypt_block(state, expand_encrypt_key(key))
@@ -0,0 +1,86 @@
+"""
+Single block AES-128 ECB backends
+
+The `cryptography` package is used when it is importable (it ships with every Home Assistant
+install), otherwise the pure-Python implementation in `_aes` is used. The selection is made once,
+at import time, and is reported by `BACKEND`.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Warning:
+    Contents of this module are intended to be used internally by the library and *not* by the
+    user. Changes to this module are not considered breaking changes and may not be documented in
+    the changelog.
+"""
+import threading
+from typing import Callable
+
+from ._constants import BLOCK_SIZE
+from ._aes import decrypt_block, encrypt_block, expand_decrypt_key, expand_encrypt_key
+
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:     # pragma: no cover - depends on the environment
+    Cipher = None
+
+BACKEND_CRYPTOGRAPHY = "cryptography"
+BACKEND_PYTHON = "python"
+
+# Encrypts one or more concatenated 16 bytes blocks in ECB mode
+Encryptor = Callable[[bytes], bytes]
+
+
+def python_decrypt_block(block: bytes, key: bytes) -> bytes:
+    return decrypt_block(block, expand_decrypt_key(key))
+
+
+def python_new_encryptor(key: bytes) -> Encryptor:
+    round_keys = expand_encrypt_key(key)
+
+    def _encrypt(data: bytes) -> bytes:
+        if len(data) == BLOCK_SIZE:
+            return encrypt_block(data, round_keys)
+        return b"".join(
+            encrypt_block(data[i:i + BLOCK_SIZE], round_keys) for i in range(0, len(data), BLOCK_SIZE)
+        )
+
+    return _encrypt
+
+
+def cryptography_decrypt_block(block: bytes, key: bytes) -> bytes:
+    decryptor = Cipher(algorithms.AES(key), modes.ECB()).decryptor()
+    return decryptor.update(block) + decryptor.finalize()
+
+
+def cryptography_new_encryptor(key: bytes) -> Encryptor:
+    # ECB contexts are stateless between blocks, so a single context can be reused indefinitely -
+    # but not by two threads at once: cryptography raises on overlapping calls
+    update = Cipher(algorithms.AES(key), modes.ECB()).encryptor().update
+    lock = threading.Lock()
+
+    def _encrypt(data: bytes) -> bytes:
+        with lock:
+            return update(data)
+
+    return _encrypt
+
+
+if Cipher is not None:
+    BACKEND = BACKEND_CRYPTOGRAPHY
+    aes_decrypt_block = cryptography_decrypt_block
+    aes_new_encryptor = cryptography_new_encryptor
+else:
+    BACKEND = BACKEND_PYTHON
+    aes_decrypt_block = python_decrypt_block
+    aes_new_encryptor = python_new_encryptor
@@ -0,0 +1,156 @@
+"""
+Micro benchmarks for the token generator
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import itertools
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from ._aes import aes_encrypt_decrypt
+from ._backend import BACKEND
+from .token_generator import TokenGenerator, _step_1, _step_2, generate_token
+from .types import TokenType
+
+BASELINE_PATH = Path(__file__).with_name("bench_baseline.json")
+
+# Baselines store each case's ops/sec relative to REFERENCE_CASE timed in the same run, so a
+# faster or slower host (or a busy one) shifts both alike. A case regresses when its relative
+# speed drops below `baseline * (1 - DEFAULT_TOLERANCE)`
+REFERENCE_CASE = "reference"
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_DURATION = 0.5      # In seconds, per case
+
+_SESSION_TOKEN = bytes.fromhex("0123456789ABCDEF0123456789ABCDEF")
+_PHONE_NUMBER = 972501234567
+_KEY = bytes(range(16))
+_REFERENCE_DATA = bytes(range(256))
+
+
+class BenchResult(NamedTuple):
+    ops_per_sec: float
+    p50_us: float
+    p90_us: float
+    p99_us: float
+
+
+def _reference() -> int:
+    """Fixed pure-Python byte and int workload the cases are measured against - never change it"""
+    acc = 0
+    for value in _REFERENCE_DATA:
+        acc = ((acc << 1) ^ value) & 0xFFFFFFFF
+    return acc
+
+
+def _cases() -> dict[str, Callable[[], object]]:
+    timestamps = itertools.count(1_700_000_000)
+    block = os.urandom(16)
+    step_1_result = _step_1(_SESSION_TOKEN, _PHONE_NUMBER)
+
+    cases = {
+        "aes_encrypt": lambda: aes_encrypt_decrypt(block, _KEY, is_encrypt=False),
+        "aes_decrypt": lambda: aes_encrypt_decrypt(block, _KEY, is_encrypt=True),
+        "step_1": lambda: _step_1(_SESSION_TOKEN, _PHONE_NUMBER),
+        "step_2": lambda: _step_2(step_1_result, next(timestamps), 0),
+        "token_generator_init": lambda: TokenGenerator(_SESSION_TOKEN, _PHONE_NUMBER, TokenType.PRIMARY),
+    }
+    for token_type in TokenType:
+        # A new timestamp per call, so the per-second token cache never hits
+        cases[f"generate_token_{token_type.name.lower()}"] = (
+            lambda token_type=token_type: generate_token(
+                _SESSION_TOKEN, _PHONE_NUMBER, token_type, timestamp_ms=next(timestamps)
+            )
+        )
+
+    return cases
+
+
+def _percentile(samples: list[int], fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] / 1000
+
+
+def bench(func: Callable[[], object], duration: float = DEFAULT_DURATION) -> BenchResult:
+    """Call `func` repeatedly for about `duration` seconds and report its throughput and latency"""
+    perf_counter_ns = time.perf_counter_ns
+    samples = []
+    deadline = perf_counter_ns() + int(duration * 1e9)
+
+    while True:
+        start = perf_counter_ns()
+        func()
+        end = perf_counter_ns()
+        samples.append(end - start)
+        if end >= deadline:
+            break
+
+    samples.sort()
+    return BenchResult(
+        ops_per_sec=len(samples) * 1e9 / sum(samples),
+        p50_us=_percentile(samples, 0.50),
+        p90_us=_percentile(samples, 0.90),
+        p99_us=_percentile(samples, 0.99),
+    )
+
+
+def run_benchmarks(duration: float = DEFAULT_DURATION) -> dict[str, BenchResult]:
+    """Run every benchmark case with the currently selected AES backend
+
+    The reference case is timed before and after the others, and reports the mean of both.
+    """
+    before = bench(_reference, duration)
+    results = {name: bench(func, duration) for name, func in _cases().items()}
+    after = bench(_reference, duration)
+    results[REFERENCE_CASE] = BenchResult(*((b + a) / 2 for b, a in zip(before, after)))
+    return results
+
+
+def relative_speeds(results: dict[str, BenchResult]) -> dict[str, float]:
+    """Return each case's ops/sec as a multiple of the reference case's"""
+    reference = results[REFERENCE_CASE].ops_per_sec
+    return {
+        name: result.ops_per_sec / reference for name, result in results.items() if name != REFERENCE_CASE
+    }
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, float]:
+    """Return the stored relative speed per case for the currently selected AES backend"""
+    try:
+        baseline = json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+    return baseline.get(BACKEND, {})
+
+
+def save_baseline(results: dict[str, BenchResult], path: Path = BASELINE_PATH) -> None:
+    """Store `results` as the baseline of the currently selected AES backend"""
+    try:
+        baseline = json.loads(path.read_text())
+    except FileNotFoundError:
+        baseline = {}
+    baseline[BACKEND] = {name: round(speed, 4) for name, speed in relative_speeds(results).items()}
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def find_regressions(results: dict[str, BenchResult],
+                     baseline: dict[str, float],
+                     tolerance: float = DEFAULT_TOLERANCE) -> dict[str, tuple[float, float]]:
+    """Return {case: (measured, baseline)} relative speeds for every case slower than the baseline allows"""
+    return {
+        name: (speed, baseline[name])
+        for name, speed in relative_speeds(results).items()
+        if name in baseline and speed < baseline[name] * (1 - tolerance)
+    }
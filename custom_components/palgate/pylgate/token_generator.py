@@ -14,8 +14,11 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+import functools
 import struct
+import threading
 import time
+from typing import Iterable, NamedTuple
 
 from ._constants import (
     BLOCK_SIZE,
@@ -24,10 +27,141 @@ from ._constants import (
     TIMESTAMP_OFFSET,
 )
 
-from ._aes import aes_encrypt_decrypt
+from ._backend import aes_decrypt_block, aes_new_encryptor
 
 from .types import TokenType
 
+# Number of per-second tokens kept by each `TokenGenerator`
+TOKEN_CACHE_SIZE = 8
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+
+class TokenGenerator:
+    """Derives tokens for a single PalGate account
+
+    The step 1 key and the AES round keys only depend on the account, so they are computed once
+    on construction and every call to `token` only performs the timestamp dependent work.
+    Tokens only change once a second, so the last `TOKEN_CACHE_SIZE` derived tokens are memoized.
+    A generator may be shared between threads.
+
+    Args:
+        session_token (bytes): Base token generated either via SMS or Device Linking.
+        phone_number (int): The phone number associated with `session_token` in international format.
+        token_type (TokenType): `session_token`'s token type
+
+    Raises:
+        ValueError: if `session_token` is not 16 bytes.
+            if `token_type`'s value does not exist
+    """
+
+    def __init__(self, session_token: bytes, phone_number: int, token_type: TokenType) -> None:
+        if len(session_token) != BLOCK_SIZE:
+            raise ValueError('Invalid session token')
+
+        self.phone_number = phone_number
+        self.token_type = token_type
+        self._prefix = _token_prefix(phone_number, token_type)
+        self._encrypt = aes_new_encryptor(_step_1(session_token, phone_number))
+        self._cache: dict[tuple[int, int], str] = {}
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def token(self,
+              timestamp_ms: int | None = None,
+              *,
+              timestamp_offset: int = TIMESTAMP_OFFSET) -> str:
+        """Generates a derived token for PalGate API
+        Args:
+            timestamp_ms (:obj:`int`, optional): time in seconds since Epoch. Defaults to current time
+            timestamp_offset (:obj:`int`, optional): offset to add to `timestamp_ms`.
+
+        Returns:
+            str: The derived token as hex string
+        """
+        if timestamp_ms is None:
+            timestamp_ms = int(time.time())
+
+        if (token := self.cached_token(timestamp_ms, timestamp_offset=timestamp_offset)) is not None:
+            return token
+
+        with self._cache_lock:
+            self.cache_misses += 1
+        step_2_result = self._encrypt(_step_2_state(timestamp_ms, timestamp_offset))
+        token = (self._prefix + step_2_result).hex().upper()
+
+        self._cache_put((timestamp_ms, timestamp_offset), token)
+
+        return token
+
+    def cached_token(self,
+                     timestamp_ms: int,
+                     *,
+                     timestamp_offset: int = TIMESTAMP_OFFSET) -> str | None:
+        """Returns the token for `timestamp_ms` if it was already derived, without any AES work
+        Args:
+            timestamp_ms (int): time in seconds since Epoch
+            timestamp_offset (:obj:`int`, optional): offset to add to `timestamp_ms`.
+
+        Returns:
+            str | None: The derived token as hex string, or None if it is not cached
+        """
+        with self._cache_lock:
+            if (token := self._cache.get((timestamp_ms, timestamp_offset))) is not None:
+                self.cache_hits += 1
+            return token
+
+    def _cache_put(self, key: tuple[int, int], token: str) -> None:
+        with self._cache_lock:
+            if key in self._cache:
+                return
+            if len(self._cache) >= TOKEN_CACHE_SIZE:
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = token
+
+    def tokens(self,
+               timestamps: Iterable[int],
+               *,
+               timestamp_offset: int = TIMESTAMP_OFFSET) -> list[str]:
+        """Generates derived tokens for many timestamps in a single multi-block AES pass
+        Args:
+            timestamps (Iterable[int]): times in seconds since Epoch
+            timestamp_offset (:obj:`int`, optional): offset to add to each timestamp.
+
+        Returns:
+            list[str]: The derived tokens as hex strings, in the order of `timestamps`
+        """
+        states = b"".join(_step_2_state(timestamp, timestamp_offset) for timestamp in timestamps)
+        encrypted = self._encrypt(states) if states else b""
+
+        return [
+            (self._prefix + encrypted[i:i + BLOCK_SIZE]).hex().upper()
+            for i in range(0, len(encrypted), BLOCK_SIZE)
+        ]
+
+    def prefetch(self,
+                 timestamps: Iterable[int],
+                 *,
+                 timestamp_offset: int = TIMESTAMP_OFFSET) -> None:
+        """Derives tokens for upcoming timestamps into the per-second cache, in one AES pass
+        Args:
+            timestamps (Iterable[int]): times in seconds since Epoch, at most `TOKEN_CACHE_SIZE` are kept
+            timestamp_offset (:obj:`int`, optional): offset to add to each timestamp.
+        """
+        with self._cache_lock:
+            missing = [timestamp for timestamp in timestamps if (timestamp, timestamp_offset) not in self._cache]
+        for timestamp, token in zip(missing, self.tokens(missing, timestamp_offset=timestamp_offset)):
+            self._cache_put((timestamp, timestamp_offset), token)
+
+    def cache_info(self) -> CacheInfo:
+        """Hit/miss counters of the per-second token cache"""
+        return CacheInfo(self.cache_hits, self.cache_misses, len(self._cache))
+
 
 def generate_token(session_token: bytes,
                    phone_number: int,
@@ -54,17 +188,46 @@ def generate_token(session_token: bytes,
             if `phone_number` is not 12 digits
             if `token_type`'s value does not exist
     """
-    if len(session_token) != BLOCK_SIZE:
-        raise ValueError('Invalid session token')
+    generator = _cached_generator(bytes(session_token), phone_number, token_type)
+
+    return generator.token(timestamp_ms, timestamp_offset=timestamp_offset)
 
-    if timestamp_ms is None:
-        timestamp_ms = int(time.time())
 
-    step_2_key = _step_1(session_token, phone_number)
+def generate_tokens_batch(accounts: Iterable[tuple[bytes, int, TokenType]],
+                          timestamps: Iterable[int] | None = None,
+                          *,
+                          timestamp_offset: int = TIMESTAMP_OFFSET) -> list[list[str]]:
+    """Generates derived tokens for many accounts and/or timestamps
+    Args:
+        accounts (Iterable[tuple[bytes, int, TokenType]]): (session_token, phone_number, token_type)
+            tuples, as accepted by `generate_token`
+        timestamps (:obj:`Iterable[int]`, optional): times in seconds since Epoch. Defaults to
+            the current time only
+        timestamp_offset (:obj:`int`, optional): offset to add to each timestamp.
 
-    step_2_result = _step_2(step_2_key, timestamp_ms, timestamp_offset)
+    Returns:
+        list[list[str]]: `result[i][j]` is the token of `accounts[i]` at `timestamps[j]`,
+            identical to what `generate_token` returns for the same arguments
 
-    result = bytearray(TOKEN_SIZE)
+    Raises:
+        ValueError: for any account `generate_token` would reject
+    """
+    timestamps = [int(time.time())] if timestamps is None else list(timestamps)
+
+    return [
+        _cached_generator(bytes(session_token), phone_number, token_type)
+        .tokens(timestamps, timestamp_offset=timestamp_offset)
+        for session_token, phone_number, token_type in accounts
+    ]
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_generator(session_token: bytes, phone_number: int, token_type: TokenType) -> TokenGenerator:
+    return TokenGenerator(session_token, phone_number, token_type)
+
+
+def _token_prefix(phone_number: int, token_type: TokenType) -> bytes:
+    result = bytearray(TOKEN_SIZE - BLOCK_SIZE)
     if token_type == TokenType.SMS:
         result[0] = 0x01
     elif token_type == TokenType.PRIMARY:
@@ -79,21 +242,23 @@ def generate_token(session_token: bytes,
     result[3] = (phone_number >> 0x18) & 0xff
     result[4:7] = struct.pack(">Q", phone_number)[5:8]
 
-    result[7:23] = step_2_result
-
-    return result.hex().upper()
+    return bytes(result)
 
 
 def _step_1(session_token: bytes, phone_number: int) -> bytes:
     key = T_C_KEY.copy()
     key[6:12] = struct.pack('>Q', phone_number)[2:]
 
-    return aes_encrypt_decrypt(session_token, bytes(key), is_encrypt=True)
+    return aes_decrypt_block(bytes(session_token), bytes(key))
 
 
-def _step_2(result_from_step_1: bytes, timestamp_ms: int, timestamp_offset: int) -> bytes:
+def _step_2_state(timestamp_ms: int, timestamp_offset: int) -> bytes:
     next_state = bytearray(BLOCK_SIZE)
     next_state[1:3] = struct.pack('<H', 0xa0a)
     next_state[10:14] = struct.pack('>I', timestamp_ms + timestamp_offset)
 
-    return aes_encrypt_decrypt(bytes(next_state), result_from_step_1, is_encrypt=False)
+    return bytes(next_state)
+
+
+def _step_2(result_from_step_1: bytes, timestamp_ms: int, timestamp_offset: int) -> bytes:
+    return aes_new_encryptor(result_from_step_1)(_step_2_state(timestamp_ms, timestamp_offset))
@@ -0,0 +1,190 @@
+"""Local, persisted index of a gate's authorized users."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .api import PalgateApiClient
+from .const import DOMAIN as PALGATE_DOMAIN
+from .const import *
+
+_LOGGER: logging.Logger = logging.getLogger(__name__)
+
+
+async def async_remove_roster(hass: HomeAssistant, base_device_id: str) -> None:
+    """Delete the stored roster of a gate controller."""
+    await Store(hass, ROSTER_STORAGE_VERSION, f"{PALGATE_DOMAIN}.roster.{base_device_id}").async_remove()
+
+
+def normalize_phone(phone: str) -> str:
+    """User ids are international phone numbers without a leading '+'."""
+    return str(phone).strip().lstrip("+")
+
+
+def _index_keys(phone: str, user: dict) -> set[str]:
+    """Keys a user can be found by: phone and lower-cased first, last and full name."""
+    first = str(user.get("firstname") or "").strip().lower()
+    last  = str(user.get("lastname") or "").strip().lower()
+    return {key for key in (phone, first, last, f"{first} {last}".strip()) if key}
+
+
+class PalgateUserRoster:
+    """Users of one gate, indexed by phone and by name prefix.
+
+    Populated from the users-v2 pages and kept in Home Assistant's storage,
+    so lookups and searches are served locally. Users we add or change are
+    re-read from the API right after; a periodic resync picks up changes
+    made elsewhere.
+    """
+
+    def __init__(self, hass: HomeAssistant, api: PalgateApiClient, base_device_id: str) -> None:
+        """Initialize."""
+
+        self.api = api
+        self._store: Store[dict[str, Any]] = Store(
+            hass, ROSTER_STORAGE_VERSION, f"{PALGATE_DOMAIN}.roster.{base_device_id}"
+        )
+        self._users: dict[str, dict] = {}
+        self._index: list[tuple[str, str]] = []     # sorted (phone or name key, phone)
+
+    # ------------------------------------------------------------------
+    # Persistence and sync
+    # ------------------------------------------------------------------
+
+    async def async_load(self) -> None:
+        """Restore the roster saved by a previous run."""
+
+        if data := await self._store.async_load():
+            self._users = data.get("users", {})
+            self._reindex()
+
+    async def async_sync(self) -> None:
+        """Re-read all users from the API and apply only what changed."""
+        result = await self.api.get_all_users()
+        self.async_apply_users(result.get("users", []))
+
+    def async_apply_users(self, users: list[dict]) -> None:
+        """Reconcile the roster with a complete user list."""
+
+        fresh = {normalize_phone(user["id"]): user for user in users if user.get("id")}
+        added = changed = removed = 0
+
+        for phone in [phone for phone in self._users if phone not in fresh]:
+            self._remove(phone)
+            removed += 1
+        for phone, user in fresh.items():
+            current = self._users.get(phone)
+            if current == user:
+                continue
+            if current is None:
+                added += 1
+            else:
+                changed += 1
+            self._put(phone, user)
+
+        if added or changed or removed:
+            _LOGGER.debug(
+                f"Roster of {self.api.device_id}: {added} added, "
+                f"{changed} changed, {removed} removed"
+            )
+            self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(lambda: {"users": self._users}, ROSTER_SAVE_DELAY)
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _reindex(self) -> None:
+        self._index = sorted(
+            (key, phone) for phone, user in self._users.items() for key in _index_keys(phone, user)
+        )
+
+    def _put(self, phone: str, user: dict) -> None:
+        if phone in self._users:
+            self._remove(phone)
+        self._users[phone] = user
+        for key in _index_keys(phone, user):
+            insort(self._index, (key, phone))
+
+    def _remove(self, phone: str) -> None:
+        user = self._users.pop(phone, None)
+        if user is None:
+            return
+        for key in _index_keys(phone, user):
+            index = bisect_left(self._index, (key, phone))
+            if index < len(self._index) and self._index[index] == (key, phone):
+                del self._index[index]
+
+    # ------------------------------------------------------------------
+    # Local updates after our own API writes
+    # ------------------------------------------------------------------
+
+    def async_upsert(self, phone: str, user: dict) -> None:
+        """Record a user as returned by the API."""
+
+        self._put(normalize_phone(phone), user)
+        self._schedule_save()
+
+    def async_delete(self, phone: str) -> None:
+        """Record a removed user."""
+
+        self._remove(normalize_phone(phone))
+        self._schedule_save()
+
+    async def async_refresh_user(self, phone: str) -> None:
+        """Re-read a user we just added or changed, as the server may fill in or adjust fields.
+
+        If that fails the local record is dropped rather than kept stale;
+        lookups of the user then go to the API until the next resync.
+        """
+        try:
+            user = await self.api.get_user(phone)
+        except HomeAssistantError as exc:
+            _LOGGER.debug(f"Re-reading user {phone} of {self.api.device_id} failed: {exc}")
+            self.async_delete(phone)
+            return
+        self.async_upsert(phone, user)
+
+    async def async_refresh_users(self, phones: list[str]) -> None:
+        """Re-read many users we just added or changed, with one resync of the whole roster."""
+        try:
+            await self.async_sync()
+        except HomeAssistantError as exc:
+            _LOGGER.debug(f"Re-reading users of {self.api.device_id} failed: {exc}")
+            for phone in phones:
+                self.async_delete(phone)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def get(self, phone: str) -> dict | None:
+        """Return the record of a user by phone number."""
+        return self._users.get(normalize_phone(phone))
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        """Users whose phone number or first/last/full name starts with query."""
+
+        query   = normalize_phone(query).lower()
+        matches: dict[str, None] = {}   # insertion-ordered set of phones
+
+        index = bisect_left(self._index, (query, ""))
+        while index < len(self._index) and len(matches) < limit:
+            key, phone = self._index[index]
+            if not key.startswith(query):
+                break
+            matches[phone] = None
+            index += 1
+
+        return [self._users[phone] for phone in matches]
+
+    def __len__(self) -> int:
+        return len(self._users)
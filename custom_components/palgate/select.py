@@ -7,12 +7,14 @@ import logging
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_DEVICE_ID, CONF_TOKEN
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .api import PalgateApiClient, RELAY_MODES
+from .coordinator import PalgateAccountCoordinator
 from .const import DOMAIN as PALGATE_DOMAIN
 from .const import *
 
@@ -29,11 +31,12 @@ async def async_setup_entry(
     device_id = entry.data[CONF_DEVICE_ID]
 
     api = hass.data[PALGATE_DOMAIN][entry.entry_id][DATA_API]
+    coordinator = hass.data[PALGATE_DOMAIN][entry.entry_id][DATA_COORDINATOR]
 
-    async_add_entities([PalgateRelayModeSelect(api, device_id)], update_before_add=True)
+    async_add_entities([PalgateRelayModeSelect(coordinator, api, device_id)])
 
 
-class PalgateRelayModeSelect(SelectEntity):
+class PalgateRelayModeSelect(CoordinatorEntity[PalgateAccountCoordinator], SelectEntity):
     """Select entity for the Palgate output relay mode."""
 
     _attr_has_entity_name                 = True
@@ -41,14 +44,15 @@ class PalgateRelayModeSelect(SelectEntity):
     # _attr_icon                            = "mdi:boom-gate-up"
     _attr_entity_registry_enabled_default = False
     translation_key                       = "relay_mode"
-    scan_interval                         = SCAN_INTERVAL
 
     def __init__(
         self,
+        coordinator: PalgateAccountCoordinator,
         api: PalgateApiClient,
         device_id: str,
     ) -> None:
         """Initialize."""
+        super().__init__(coordinator)
         self.api = api
         self._attr_unique_id   = f"{device_id}_relay_mode"
         self._attr_device_info = DeviceInfo(
@@ -56,23 +60,37 @@ class PalgateRelayModeSelect(SelectEntity):
         )
         self._attr_current_option: str | None = None
         self._attr_available: bool = False
+        self._update_from_device()
 
-    async def async_update(self) -> None:
-        """Fetch current relay mode and permission flag from the device."""
+    @callback
+    def _update_from_device(self) -> None:
+        """Derive relay mode and permission flag from the shared device record."""
 
-        try:
-            self._attr_current_option = await self.api.get_relay_mode()
-            self._attr_available      = self.api.relay_mode_permitted
-
-        except Exception as exc:
-            _LOGGER.error("Failed to fetch relay mode for %s: %s", self.unique_id, exc)
+        device = self.coordinator.device(self.api.base_device_id)
+        if not self.coordinator.last_update_success or device is None:
             self._attr_available = False
+            return
+
+        self._attr_current_option = self.api.relay_mode_from_device(device)
+        self._attr_available      = self.api.relay_mode_permitted
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._update_from_device()
+        super()._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        return self._attr_available
 
     async def async_select_option(self, option: str) -> None:
         """Handle user selecting a new relay mode."""
         await self.api.set_relay_mode(option)
         self._attr_current_option = option
         self.async_write_ha_state()
+        self.coordinator.async_tighten()
+        await self.coordinator.async_request_refresh()
 
     @property
     def icon(self) -> str:
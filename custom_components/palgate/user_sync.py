@@ -0,0 +1,130 @@
+"""Desired user list loading and diffing for palgate.sync_users."""
+
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Any, Iterable
+
+import voluptuous as vol
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util.yaml import load_yaml
+
+from .roster import normalize_phone
+
+# The user record fields sync_users knows how to compare. Unlike the
+# single-user actions, a synced list is diffed against the gate's records,
+# so values must arrive with the API's types: CSV cells and loosely typed
+# YAML are coerced here, and unknown fields are rejected rather than
+# being re-sent on every sync.
+USER_SETTINGS_SCHEMA = vol.Schema({
+    vol.Optional("firstname"):       cv.string,
+    vol.Optional("lastname"):        cv.string,
+    vol.Optional("admin"):           cv.boolean,
+    vol.Optional("output1"):         cv.boolean,
+    vol.Optional("output2"):         cv.boolean,
+    vol.Optional("output1Latch"):    cv.boolean,
+    vol.Optional("dialToOpen"):      cv.boolean,
+    vol.Optional("secondaryDevice"): cv.boolean,
+})
+
+
+def _desired_user(phone: Any, settings: Any, where: str) -> dict:
+    """One validated {phone, settings} record; where names its place in the file."""
+    if phone in (None, ""):
+        raise HomeAssistantError(f"{where} has no phone")
+    try:
+        return {"phone": str(phone), "settings": USER_SETTINGS_SCHEMA(settings or {})}
+    except vol.Invalid as exc:
+        raise HomeAssistantError(f"Invalid settings for {phone} ({where}): {exc}") from exc
+
+
+def load_user_file(path: str) -> list[dict]:
+    """Read a desired user list from a CSV or YAML file. Runs in the executor.
+
+    CSV files need a "phone" column; all other non-empty cells become
+    settings. YAML files hold either a list of {phone, settings} records or
+    a mapping of phone -> settings. Settings are checked against
+    USER_SETTINGS_SCHEMA, and errors name the offending row.
+    """
+    suffix = Path(path).suffix.lower()
+
+    try:
+        if suffix == ".csv":
+            with open(path, encoding="utf-8-sig", newline="") as file:
+                rows = list(csv.DictReader(file))
+            if rows and "phone" not in rows[0]:
+                raise HomeAssistantError(f"{path} has no 'phone' column")
+            return [
+                _desired_user(
+                    row["phone"],
+                    {
+                        key: value
+                        for key, value in row.items()
+                        if key and key != "phone" and value not in (None, "")
+                    },
+                    f"{path} line {line}",
+                )
+                for line, row in enumerate(rows, start=2)
+                if row.get("phone")
+            ]
+
+        if suffix in (".yaml", ".yml"):
+            data = load_yaml(path) or []
+            if isinstance(data, dict):
+                return [
+                    _desired_user(phone, settings, f"{path} user {phone}")
+                    for phone, settings in data.items()
+                ]
+            if isinstance(data, list):
+                users = []
+                for index, user in enumerate(data, start=1):
+                    if not isinstance(user, dict):
+                        raise HomeAssistantError(f"{path} entry {index} is not a {{phone, settings}} record")
+                    users.append(_desired_user(user.get("phone"), user.get("settings"), f"{path} entry {index}"))
+                return users
+            raise HomeAssistantError(f"{path} must hold a list or a mapping of users")
+
+    except (OSError, csv.Error) as exc:
+        raise HomeAssistantError(f"Cannot read users from {path}: {exc}") from exc
+
+    raise HomeAssistantError(f"Unsupported user file type '{suffix}', use .csv or .yaml")
+
+
+def compute_user_diff(
+    current: list[dict],
+    desired: list[dict],
+    remove_missing: bool = False,
+    keep: Iterable[str] = (),
+) -> tuple[list[tuple[str, str, dict | None]], int]:
+    """Minimal (action, phone, settings) changes turning current into desired.
+
+    Users are matched by phone. Existing users are updated with only the
+    settings that differ from their current record; with remove_missing,
+    users absent from desired are removed - except the phones in keep (the
+    linked account, which Home Assistant needs to reach the gate). Returns
+    (changes, unchanged count).
+    """
+    existing = {normalize_phone(user["id"]): user for user in current if user.get("id")}
+    wanted   = {normalize_phone(user["phone"]): user.get("settings") or {} for user in desired}
+
+    changes: list[tuple[str, str, dict | None]] = []
+    unchanged = 0
+
+    for phone, settings in wanted.items():
+        if (user := existing.get(phone)) is None:
+            changes.append(("add", phone, settings))
+        elif delta := {key: value for key, value in settings.items() if user.get(key) != value}:
+            changes.append(("set", phone, delta))
+        else:
+            unchanged += 1
+
+    if remove_missing:
+        keep = {normalize_phone(phone) for phone in keep}
+        changes.extend(
+            ("remove", phone, None) for phone in existing if phone not in wanted and phone not in keep
+        )
+
+    return changes, unchanged
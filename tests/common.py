@@ -0,0 +1,107 @@
+"""Helpers for tests that run against Home Assistant (pytest-homeassistant-custom-component)."""
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import Any
+
+from homeassistant.const import CONF_DEVICE_ID, CONF_TOKEN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+
+from custom_components.palgate.api import PalgateApiClient
+from custom_components.palgate.const import (
+    BASE_URL,
+    CONF_ADVANCED,
+    CONF_ALLOW_INVERT_AS_STOP,
+    CONF_PHONE_NUMBER,
+    CONF_SECONDS_OPEN,
+    CONF_SECONDS_TO_CLOSE,
+    CONF_SECONDS_TO_OPEN,
+    CONF_TOKEN_TYPE,
+    DOMAIN,
+)
+
+DEVICE_ID = "AB12CD34"
+DEVICE_URL = f"{BASE_URL}/device/{DEVICE_ID}"
+PHONE_NUMBER = "972500000001"
+SESSION_TOKEN = "0123456789abcdef0123456789abcdef"
+
+
+def make_client(session, device_id: str = DEVICE_ID, **kwargs: Any) -> PalgateApiClient:
+    """API client of one gate output, talking through session."""
+    return PalgateApiClient(
+        device_id=device_id,
+        token=SESSION_TOKEN,
+        token_type="1",
+        phone_number=PHONE_NUMBER,
+        seconds_to_open=1,
+        seconds_open=1,
+        seconds_to_close=1,
+        allow_invert_as_stop=True,
+        session=session,
+        **kwargs,
+    )
+
+
+def blocked_reply(release: asyncio.Event, method: str, url: str, json: dict):
+    """side_effect for AiohttpClientMocker holding the reply until release is set."""
+
+    async def side_effect(*_: Any) -> AiohttpClientMockResponse:
+        await release.wait()
+        return AiohttpClientMockResponse(method, url, json=json)
+
+    return side_effect
+
+
+def mock_config_entry(device_id: str = DEVICE_ID, phone_number: str = PHONE_NUMBER) -> MockConfigEntry:
+    """Config entry of one gate output linked through phone_number."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        version=3,
+        title=device_id,
+        unique_id=device_id,
+        data={
+            CONF_DEVICE_ID: device_id,
+            CONF_TOKEN: SESSION_TOKEN,
+            CONF_TOKEN_TYPE: "1",
+            CONF_PHONE_NUMBER: phone_number,
+            CONF_ADVANCED: {
+                CONF_SECONDS_TO_OPEN: 1,
+                CONF_SECONDS_OPEN: 1,
+                CONF_SECONDS_TO_CLOSE: 1,
+                CONF_ALLOW_INVERT_AS_STOP: True,
+            },
+        },
+    )
+
+
+def mock_api_replies(aioclient_mock: AiohttpClientMocker, device_ids: list[str]) -> None:
+    """Answer every read a loaded entry makes: account devices, device records, users and log."""
+    aioclient_mock.get(f"{BASE_URL}/devices", json={"devices": [{"id": device_id} for device_id in device_ids]})
+    aioclient_mock.get(re.compile(rf"{re.escape(BASE_URL)}/device/[^/?]+/users-v2"), json={"count": 0, "users": []})
+    aioclient_mock.get(re.compile(rf"{re.escape(BASE_URL)}/device/[^/?]+$"), json={"device": {}})
+    aioclient_mock.get(f"{BASE_URL}/user/log", json={"log": []})
+
+
+def calls_to(aioclient_mock: AiohttpClientMocker, url: str) -> int:
+    """Number of requests made to url, ignoring its query."""
+    return sum(str(called.with_query(None)) == url for _, called, *_ in aioclient_mock.mock_calls)
+
+
+async def async_load_entries(hass: HomeAssistant, *entries: MockConfigEntry) -> None:
+    """Add entries to hass and set them up."""
+    for entry in entries:
+        entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entries[0].entry_id)
+    await hass.async_block_till_done()
+
+
+def cover_entity_id(hass: HomeAssistant, entry: MockConfigEntry) -> str:
+    """Entity id of an entry's gate cover, the target of the palgate.* actions."""
+    return er.async_get(hass).async_get_entity_id("cover", DOMAIN, entry.data[CONF_DEVICE_ID])
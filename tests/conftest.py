@@ -0,0 +1,7 @@
+"""Shared test setup for the Palgate integration."""
+from pathlib import Path
+import sys
+
+# pylgate has no Home Assistant dependency: import it as a top-level package. Appended, so the
+# integration's own modules (select.py) do not shadow the standard library
+sys.path.append(str(Path(__file__).parents[1] / "custom_components" / "palgate"))
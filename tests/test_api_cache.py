@@ -0,0 +1,106 @@
+"""Read cache of the API client: TTL, invalidation by writes, shared in-flight GETs."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from yarl import URL
+
+from custom_components.palgate.api import get_device_read_cache
+
+from .common import DEVICE_ID, DEVICE_URL, PHONE_NUMBER, blocked_reply, make_client
+
+USER_URL = f"{DEVICE_URL}/user"
+
+
+async def test_device_data_cached_until_ttl(hass, aioclient_mock):
+    aioclient_mock.get(DEVICE_URL, json={"device": {"name": "gate"}})
+    client = make_client(async_get_clientsession(hass), device_cache_ttl=0.05)
+
+    assert await client.get_device_data() == {"name": "gate"}
+    assert await client.get_device_data() == {"name": "gate"}
+    assert aioclient_mock.call_count == 1
+    assert (client.cache_hits, client.cache_misses) == (1, 1)
+
+    await asyncio.sleep(0.06)
+    await client.get_device_data()
+    assert aioclient_mock.call_count == 2
+
+    await client.get_device_data(fresh=True)
+    assert aioclient_mock.call_count == 3
+
+
+async def test_write_invalidates_user_reads(hass, aioclient_mock):
+    aioclient_mock.get(USER_URL, json={"user": {"id": PHONE_NUMBER, "firstname": "A"}})
+    aioclient_mock.put(USER_URL, json={"status": "ok"})
+    client = make_client(async_get_clientsession(hass))
+
+    await client.get_user(PHONE_NUMBER)
+    await client.get_user(PHONE_NUMBER)
+    assert aioclient_mock.call_count == 1
+
+    await client.set_user_settings(PHONE_NUMBER, {"firstname": "B"})
+    await client.get_user(PHONE_NUMBER)
+    assert [method for method, *_ in aioclient_mock.mock_calls] == ["GET", "PUT", "GET"]
+
+
+async def test_outputs_of_one_controller_share_the_cache(hass, aioclient_mock):
+    aioclient_mock.get(DEVICE_URL, json={"device": {"name": "gate"}})
+    aioclient_mock.get(USER_URL, json={"user": {"id": PHONE_NUMBER}})
+    aioclient_mock.delete(USER_URL, json={"status": "ok"})
+    session = async_get_clientsession(hass)
+    read_cache = get_device_read_cache(hass, DEVICE_ID)
+    first = make_client(session, device_id=f"{DEVICE_ID}:1", read_cache=read_cache)
+    second = make_client(session, device_id=f"{DEVICE_ID}:2", read_cache=read_cache)
+
+    await first.get_device_data()
+    await second.get_device_data()
+    await first.get_user(PHONE_NUMBER)
+    assert aioclient_mock.call_count == 2
+
+    # A write through one output is seen by the other
+    await second.remove_user(PHONE_NUMBER)
+    await first.get_user(PHONE_NUMBER)
+    await first.get_device_data()
+    assert aioclient_mock.call_count == 4
+
+
+async def test_concurrent_reads_share_one_request(hass, aioclient_mock):
+    release = asyncio.Event()
+    aioclient_mock.get(
+        DEVICE_URL, side_effect=blocked_reply(release, "get", URL(DEVICE_URL), {"device": {"name": "gate"}})
+    )
+    client = make_client(async_get_clientsession(hass))
+
+    reads = [hass.async_create_task(client.get_device_data()) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*reads) == [{"name": "gate"}] * 3
+    assert aioclient_mock.call_count == 1
+
+
+async def test_write_drops_read_in_flight(hass, aioclient_mock):
+    release = asyncio.Event()
+    aioclient_mock.get(
+        USER_URL, side_effect=blocked_reply(release, "get", URL(USER_URL), {"user": {"id": PHONE_NUMBER}})
+    )
+    aioclient_mock.put(USER_URL, json={"status": "ok"})
+    client = make_client(async_get_clientsession(hass))
+
+    stale = hass.async_create_task(client.get_user(PHONE_NUMBER))
+    await asyncio.sleep(0)
+    await client.set_user_settings(PHONE_NUMBER, {"firstname": "B"})
+
+    # The read started after the write does not join the older request ...
+    fresh = hass.async_create_task(client.get_user(PHONE_NUMBER))
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(stale, fresh)
+    assert [method for method, *_ in aioclient_mock.mock_calls] == ["GET", "PUT", "GET"]
+
+    # ... and the older reply was not cached
+    await client.get_user(PHONE_NUMBER)
+    assert aioclient_mock.call_count == 3
@@ -0,0 +1,93 @@
+"""Paged user reads of the API client."""
+import re
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMockResponse
+
+from .common import DEVICE_URL, make_client
+
+USERS_URL = re.compile(rf"{re.escape(DEVICE_URL)}/users-v2")
+
+
+class FakeUsersEndpoint:
+    """users-v2 over a mutable user list, capping pages at max_limit."""
+
+    def __init__(self, count: int, max_limit: int = 50) -> None:
+        self.users = [{"id": f"97250{index:07d}"} for index in range(count)]
+        self.max_limit = max_limit
+        self.pages: list[tuple[int, int]] = []
+        self.on_page = None
+
+    async def __call__(self, method, url, data) -> AiohttpClientMockResponse:
+        skip, limit = int(url.query["skip"]), int(url.query["limit"])
+        self.pages.append((skip, limit))
+        page = self.users[skip:skip + min(limit, self.max_limit)]
+        reply = {"count": len(self.users), "users": page}
+        if self.on_page:
+            self.on_page(skip)
+        return AiohttpClientMockResponse(method, url, json=reply)
+
+
+@pytest.fixture
+def endpoint(aioclient_mock):
+    endpoint = FakeUsersEndpoint(120)
+    aioclient_mock.get(USERS_URL, side_effect=endpoint)
+    return endpoint
+
+
+async def test_pages_after_the_first_are_fetched_by_offset(hass, endpoint):
+    client = make_client(async_get_clientsession(hass))
+
+    result = await client.get_all_users(page_size=50)
+
+    assert result == {"count": 120, "users": endpoint.users}
+    assert sorted(endpoint.pages) == [(0, 50), (50, 50), (100, 50)]
+
+
+async def test_page_size_follows_the_server_cap(hass, endpoint):
+    endpoint.max_limit = 20
+    client = make_client(async_get_clientsession(hass))
+
+    result = await client.get_all_users(page_size=50)
+
+    assert result["users"] == endpoint.users
+    assert sorted(endpoint.pages) == [(0, 50)] + [(skip, 20) for skip in range(20, 120, 20)]
+
+
+async def test_single_page(hass, aioclient_mock):
+    endpoint = FakeUsersEndpoint(3)
+    aioclient_mock.get(USERS_URL, side_effect=endpoint)
+    client = make_client(async_get_clientsession(hass))
+
+    assert await client.get_all_users() == {"count": 3, "users": endpoint.users}
+    assert endpoint.pages == [(0, 50)]
+
+
+async def test_count_change_while_paging_rereads_sequentially(hass, endpoint):
+    client = make_client(async_get_clientsession(hass))
+
+    def add_user_once(skip: int) -> None:
+        if skip == 50 and len(endpoint.users) == 120:
+            endpoint.users.insert(0, {"id": "972599999999"})
+
+    endpoint.on_page = add_user_once
+    result = await client.get_all_users(page_size=50)
+
+    assert result == {"count": 121, "users": endpoint.users}
+    # The sequential re-read asks again for the first page instead of using the cached one
+    assert endpoint.pages[3:] == [(0, 50), (50, 50), (100, 50)]
+
+
+async def test_cached_pages_from_before_a_change_are_not_trusted(hass, endpoint):
+    client = make_client(async_get_clientsession(hass))
+    await client.get_users_page(skip=100, limit=50)
+
+    # Cached last page says 120 users, the others now say 121
+    endpoint.users.append({"id": "972599999999"})
+    result = await client.get_all_users(page_size=50)
+
+    assert result == {"count": 121, "users": endpoint.users}
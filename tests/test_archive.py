@@ -0,0 +1,92 @@
+"""Long-term log archive: daily segments, their index, and range queries."""
+from datetime import datetime, timezone
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from custom_components.palgate.archive import PalgateLogArchive
+from custom_components.palgate.const import DATA_ARCHIVE, DOMAIN, LOG_ARCHIVE_DIR
+
+from .common import async_load_entries, mock_api_replies, mock_config_entry
+
+DAY1 = datetime(2026, 3, 1, 23, 0, tzinfo=timezone.utc).timestamp()
+DAY2 = datetime(2026, 3, 2, 1, 0, tzinfo=timezone.utc).timestamp()
+
+
+def _record(time: float, user: str = "972501111111") -> dict:
+    return {"time": time, "userId": user, "type": 1, "reason": 0}
+
+
+@pytest.fixture
+async def archive(hass, tmp_path):
+    hass.config.config_dir = str(tmp_path)
+    return PalgateLogArchive(hass, "GATE1")
+
+
+async def test_records_are_split_into_daily_segments(hass, archive):
+    await archive.async_append([_record(DAY1), _record(DAY2, "+972502222222")])
+    await archive.async_append([_record(DAY1 + 60, "972503333333")])
+
+    assert sorted(path.name for path in archive.path.iterdir()) == [
+        "2026-03-01.idx.json", "2026-03-01.jsonl.gz", "2026-03-02.idx.json", "2026-03-02.jsonl.gz",
+    ]
+    with gzip.open(archive.path / "2026-03-01.jsonl.gz", "rt", encoding="utf-8") as segment:
+        assert [json.loads(line) for line in segment] == [_record(DAY1), _record(DAY1 + 60, "972503333333")]
+    assert json.loads((archive.path / "2026-03-01.idx.json").read_text()) == {
+        "min_time": DAY1,
+        "max_time": DAY1 + 60,
+        "count":    2,
+        "users":    ["972501111111", "972503333333"],
+    }
+    assert json.loads((archive.path / "2026-03-02.idx.json").read_text())["users"] == ["972502222222"]
+
+
+async def test_query_bounds_user_and_limit(hass, archive):
+    records = [_record(DAY1 + offset) for offset in range(0, 300, 60)] + [_record(DAY2, "972502222222")]
+    await archive.async_append(records)
+
+    assert await archive.async_query() == records[::-1]
+    assert await archive.async_query(since=DAY1 + 60, until=DAY1 + 180) == [
+        _record(DAY1 + 180), _record(DAY1 + 120), _record(DAY1 + 60),
+    ]
+    assert await archive.async_query(user="+972502222222") == [_record(DAY2, "972502222222")]
+    assert await archive.async_query(limit=3) == [records[-1], records[-2], records[-3]]
+    assert await archive.async_query(since=DAY2 + 1) == []
+
+
+async def test_query_skips_segments_outside_the_range(hass, archive, caplog):
+    await archive.async_append([_record(DAY1), _record(DAY2)])
+    (archive.path / "2026-03-01.jsonl.gz").write_bytes(b"not gzip")
+
+    assert await archive.async_query(since=DAY2) == [_record(DAY2)]
+    assert "unreadable" not in caplog.text
+
+    assert await archive.async_query() == [_record(DAY2)]
+    assert "Skipping unreadable archive segment 2026-03-01" in caplog.text
+
+
+async def test_seed_only_fills_a_new_archive(hass, archive):
+    await archive.async_seed([_record(DAY1)])
+    await archive.async_seed([_record(DAY2)])
+
+    assert await archive.async_query() == [_record(DAY1)]
+
+
+async def test_outputs_of_one_controller_share_one_archive(
+    hass, aioclient_mock, enable_custom_integrations, tmp_path
+):
+    hass.config.config_dir = str(tmp_path)
+    mock_api_replies(aioclient_mock, ["GATE1"])
+    entries = [mock_config_entry("GATE1"), mock_config_entry("GATE1:2")]
+    await async_load_entries(hass, *entries)
+
+    first, second = (hass.data[DOMAIN][entry.entry_id][DATA_ARCHIVE] for entry in entries)
+    assert first is second
+    assert first.path == tmp_path / LOG_ARCHIVE_DIR / "gate1"
+
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
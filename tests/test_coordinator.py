@@ -0,0 +1,81 @@
+"""Account coordinator shared by the config entries of one linked phone."""
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.palgate.const import BASE_URL, DATA_COORDINATORS
+
+from .common import PHONE_NUMBER, calls_to, mock_api_replies, mock_config_entry
+
+DEVICES_URL = f"{BASE_URL}/devices"
+
+
+@pytest.fixture
+async def entries(hass, aioclient_mock, enable_custom_integrations):
+    """Two gates linked through the same phone, both loaded."""
+    mock_api_replies(aioclient_mock, ["GATE1", "GATE2"])
+    entries = [mock_config_entry("GATE1"), mock_config_entry("GATE2")]
+    for entry in entries:
+        entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entries[0].entry_id)
+    await hass.async_block_till_done()
+    assert [entry.state for entry in entries] == [ConfigEntryState.LOADED] * 2
+
+    yield entries
+
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def _next_poll(hass, coordinator) -> None:
+    async_fire_time_changed(hass, dt_util.utcnow() + coordinator.update_interval + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+
+async def test_one_refresh_for_all_gates_of_a_phone(hass, aioclient_mock, entries):
+    coordinator = hass.data[DATA_COORDINATORS][PHONE_NUMBER]
+    assert set(coordinator.data) == {"GATE1", "GATE2"}
+    assert calls_to(aioclient_mock, DEVICES_URL) == 1
+
+
+async def test_reloading_one_entry_keeps_refreshing(hass, aioclient_mock, entries):
+    coordinator = hass.data[DATA_COORDINATORS][PHONE_NUMBER]
+
+    assert await hass.config_entries.async_reload(entries[0].entry_id)
+    await hass.async_block_till_done()
+    assert hass.data[DATA_COORDINATORS][PHONE_NUMBER] is coordinator
+
+    polls = calls_to(aioclient_mock, DEVICES_URL)
+    await _next_poll(hass, coordinator)
+    assert calls_to(aioclient_mock, DEVICES_URL) == polls + 1
+    assert coordinator.last_update_success
+
+
+async def test_last_entry_unload_shuts_the_coordinator_down(hass, aioclient_mock, entries):
+    coordinator = hass.data[DATA_COORDINATORS][PHONE_NUMBER]
+
+    await hass.config_entries.async_unload(entries[0].entry_id)
+    await hass.async_block_till_done()
+    assert not coordinator._shutdown_requested
+
+    await hass.config_entries.async_unload(entries[1].entry_id)
+    await hass.async_block_till_done()
+    assert coordinator._shutdown_requested
+    assert PHONE_NUMBER not in hass.data[DATA_COORDINATORS]
+
+    polls = calls_to(aioclient_mock, DEVICES_URL)
+    await _next_poll(hass, coordinator)
+    assert calls_to(aioclient_mock, DEVICES_URL) == polls
+
+    # Set up again, the account gets a new coordinator
+    await hass.config_entries.async_setup(entries[0].entry_id)
+    await hass.async_block_till_done()
+    assert hass.data[DATA_COORDINATORS][PHONE_NUMBER] is not coordinator
+    assert calls_to(aioclient_mock, DEVICES_URL) == polls + 1
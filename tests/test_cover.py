@@ -0,0 +1,111 @@
+"""Gate cover: open debouncing, retries after a failed open, and the bounded window option."""
+import asyncio
+import re
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.components.cover import DATA_COMPONENT
+from homeassistant.const import CONF_DEVICE_ID
+from homeassistant.data_entry_flow import InvalidData
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.palgate.const import (
+    CONF_ADVANCED,
+    CONF_ALLOW_INVERT_AS_STOP,
+    CONF_OPEN_DEBOUNCE,
+    CONF_SECONDS_OPEN,
+    CONF_SECONDS_TO_CLOSE,
+    CONF_SECONDS_TO_OPEN,
+    OPEN_DEBOUNCE,
+    OPEN_DEBOUNCE_MAX,
+)
+
+from .common import (
+    async_load_entries,
+    blocked_reply,
+    cover_entity_id,
+    mock_api_replies,
+    mock_config_entry,
+)
+
+OPEN_URL = re.compile(r"/device/GATE1/open-gate")
+
+
+def _opens(aioclient_mock) -> int:
+    return sum(bool(OPEN_URL.search(str(url))) for _, url, *_ in aioclient_mock.mock_calls)
+
+
+@pytest.fixture
+async def entry(hass, aioclient_mock, enable_custom_integrations):
+    mock_api_replies(aioclient_mock, ["GATE1"])
+    entry = mock_config_entry("GATE1")
+    # Gate commands through the mocked HA session instead of their own connection pool
+    with patch("custom_components.palgate.create_command_session", return_value=None):
+        await async_load_entries(hass, entry)
+    yield entry
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@pytest.fixture
+def cover(hass, entry):
+    return hass.data[DATA_COMPONENT].get_entity(cover_entity_id(hass, entry))
+
+
+async def test_repeated_opens_share_one_command(hass, aioclient_mock, cover):
+    release = asyncio.Event()
+    aioclient_mock.get(OPEN_URL, side_effect=blocked_reply(release, "GET", "open-gate", {"status": "ok"}))
+
+    # Opens while one is in flight join it
+    first  = asyncio.create_task(cover.async_open_cover())
+    second = asyncio.create_task(cover.async_open_cover())
+    await asyncio.sleep(0)
+    assert cover.is_opening
+    release.set()
+    await asyncio.gather(first, second)
+    assert _opens(aioclient_mock) == 1
+
+    # ... and so do those within the window after it succeeded, without extending the window
+    started = cover._open_started
+    cover._open_started = started = started - (OPEN_DEBOUNCE - 0.5)
+    await cover.async_open_cover()
+    assert _opens(aioclient_mock) == 1
+    assert cover._open_started == started
+    assert cover.api.opens_collapsed == 2
+
+    cover._open_started -= 1
+    await cover.async_open_cover()
+    assert _opens(aioclient_mock) == 2
+
+
+async def test_open_after_a_failed_open_is_sent_again(hass, aioclient_mock, cover):
+    aioclient_mock.get(OPEN_URL, status=400, text="denied")
+    with pytest.raises(ServiceValidationError, match="Not OK 400"):
+        await cover.async_open_cover()
+    assert not cover.is_opening
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OPEN_URL, json={"status": "ok"})
+    await cover.async_open_cover()
+    assert _opens(aioclient_mock) == 1
+    assert cover.api.opens_collapsed == 0
+
+
+@pytest.mark.parametrize("open_debounce", [-1, OPEN_DEBOUNCE_MAX + 1])
+async def test_debounce_window_is_bounded(hass, entry, open_debounce):
+    result = await entry.start_reconfigure_flow(hass)
+    advanced = {
+        CONF_SECONDS_TO_OPEN: 1,
+        CONF_SECONDS_OPEN: 1,
+        CONF_SECONDS_TO_CLOSE: 1,
+        CONF_ALLOW_INVERT_AS_STOP: True,
+        CONF_OPEN_DEBOUNCE: open_debounce,
+    }
+
+    with pytest.raises(InvalidData):
+        await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_DEVICE_ID: "GATE1", CONF_ADVANCED: advanced}
+        )
@@ -0,0 +1,69 @@
+"""Account-wide request dispatcher: priority order and interactive overdraw."""
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from custom_components.palgate.const import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, PRIORITY_SERVICE
+from custom_components.palgate.dispatcher import PalgateDispatcher
+
+RATE = 50     # a token every 20 ms
+
+
+async def test_waiters_are_released_by_priority_then_arrival():
+    dispatcher = PalgateDispatcher(rate=RATE, burst=1)
+    await dispatcher.acquire(PRIORITY_BACKGROUND)
+    released = []
+
+    async def request(priority: int, name: str) -> None:
+        await dispatcher.acquire(priority)
+        released.append(name)
+
+    await asyncio.gather(
+        request(PRIORITY_BACKGROUND, "poll 1"),
+        request(PRIORITY_SERVICE, "action 1"),
+        request(PRIORITY_BACKGROUND, "poll 2"),
+        request(PRIORITY_SERVICE, "action 2"),
+    )
+
+    assert released == ["action 1", "action 2", "poll 1", "poll 2"]
+    assert dispatcher.stats["service"]["waited"] == dispatcher.stats["background"]["waited"] == 2
+
+
+async def test_interactive_requests_overdraw_instead_of_waiting():
+    dispatcher = PalgateDispatcher(rate=RATE, burst=2)
+    await dispatcher.acquire(PRIORITY_BACKGROUND)
+    await dispatcher.acquire(PRIORITY_BACKGROUND)
+    start = time.monotonic()
+    queued = asyncio.create_task(dispatcher.acquire(PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+
+    # The bucket is empty and a request is queued, yet the gate command goes first
+    await dispatcher.acquire(PRIORITY_INTERACTIVE)
+    assert not queued.done()
+    assert dispatcher.diagnostics()["tokens"] == pytest.approx(-1, abs=0.2)
+    assert dispatcher.stats["interactive"]["waited"] == 0
+
+    # ... and the overdrawn token is paid back by the queued request
+    await queued
+    assert time.monotonic() - start >= 1.5 / RATE
+
+
+async def test_cancelled_waiters_do_not_take_tokens():
+    dispatcher = PalgateDispatcher(rate=RATE, burst=1)
+    await dispatcher.acquire(PRIORITY_BACKGROUND)
+    cancelled = asyncio.create_task(dispatcher.acquire(PRIORITY_SERVICE))
+    queued    = asyncio.create_task(dispatcher.acquire(PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+
+    # One token, released now: it goes to the queued request, not to the cancelled one ahead of it
+    dispatcher._wakeup.cancel()
+    dispatcher._tokens, dispatcher._updated = 1.0, time.monotonic()
+    dispatcher._release()
+    await asyncio.sleep(0)
+    assert queued.done()
+    assert dispatcher.diagnostics()["queued"] == 0
@@ -0,0 +1,53 @@
+"""palgate_access events fired from new access log records."""
+from datetime import timedelta
+import time
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_capture_events, async_fire_time_changed
+
+from custom_components.palgate.const import BASE_URL, DATA_ROSTER, DOMAIN, EVENT_PALGATE_ACCESS, LOG_POLL_MAX
+
+from .common import async_load_entries, calls_to, mock_api_replies, mock_config_entry
+
+LOG_URL = f"{BASE_URL}/user/log"
+
+
+async def test_outputs_of_one_controller_fire_one_event_per_record(
+    hass, aioclient_mock, enable_custom_integrations, tmp_path
+):
+    hass.config.config_dir = str(tmp_path)
+    mock_api_replies(aioclient_mock, ["GATE1"])
+    entries = [mock_config_entry("GATE1"), mock_config_entry("GATE1:2")]
+    await async_load_entries(hass, *entries)
+    hass.data[DOMAIN][entries[0].entry_id][DATA_ROSTER].async_apply_users(
+        [{"id": "972501111111", "firstname": "Alice", "lastname": "Cohen"}]
+    )
+    events = async_capture_events(hass, EVENT_PALGATE_ACCESS)
+
+    record = {"time": int(time.time()), "userId": "+972501111111", "type": 1, "reason": 0}
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(LOG_URL, json={"log": [record]})
+    mock_api_replies(aioclient_mock, ["GATE1"])
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=LOG_POLL_MAX + 1))
+    await hass.async_block_till_done()
+
+    assert calls_to(aioclient_mock, LOG_URL) == 1
+    assert [event.data for event in events] == [
+        {
+            "device_id": "GATE1",
+            "user_id":   "972501111111",
+            "name":      "Alice Cohen",
+            "time":      dt_util.utc_from_timestamp(record["time"]).isoformat(),
+            "type":      1,
+            "reason":    0,
+            "record":    record,
+        }
+    ]
+
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
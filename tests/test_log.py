@@ -0,0 +1,135 @@
+"""Access log collector: cursor, cap, and sharing it between the outputs of one controller."""
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.palgate import log as log_module
+from custom_components.palgate.const import (
+    BASE_URL,
+    DATA_CONTROLLERS,
+    DATA_LOG,
+    DATA_ROSTER,
+    DOMAIN,
+    GATE_STATE_CLOSED,
+    GATE_STATE_OPEN,
+    LOG_POLL_FAST,
+)
+from custom_components.palgate.log import PalgateLogCollector, PalgateLogPoller
+
+from .common import async_load_entries, calls_to, make_client, mock_api_replies, mock_config_entry
+
+LOG_URL = f"{BASE_URL}/user/log"
+
+
+def _record(time: int, user: str = "972501111111", type_: int = 1) -> dict:
+    return {"time": time, "userId": user, "type": type_, "reason": 0}
+
+
+@pytest.fixture
+async def log(hass):
+    return PalgateLogCollector(hass, make_client(async_get_clientsession(hass)), "GATE")
+
+
+def _reply(aioclient_mock, records: list[dict]) -> None:
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(LOG_URL, json={"log": records})
+
+
+async def test_records_sharing_the_cursor_second_are_kept_once(hass, aioclient_mock, log):
+    first, second = _record(100), _record(100, user="972502222222")
+    _reply(aioclient_mock, [second, first, _record(99)])
+    assert await log.async_poll() == [_record(99), second, first]
+
+    # The API returns its full log again: only records past the cursor, or new at its second, are new
+    third, later = _record(100, type_=2), _record(101)
+    _reply(aioclient_mock, [later, third, second, first, _record(99)])
+    assert await log.async_poll() == [third, later]
+
+    _reply(aioclient_mock, [later, third, second, first])
+    assert await log.async_poll() == []
+    assert log.query() == [later, third, first, second, _record(99)]
+
+
+async def test_cursor_survives_a_restart(hass, aioclient_mock, hass_storage, log):
+    _reply(aioclient_mock, [_record(100), _record(100, type_=2)])
+    await log.async_poll()
+    await hass.async_block_till_done()
+    await log._store.async_save({"records": log.query()[::-1]})
+
+    restored = PalgateLogCollector(hass, log.api, "GATE")
+    await restored.async_load()
+    assert await restored.async_poll() == []
+
+
+async def test_store_is_capped_to_the_newest_records(hass, aioclient_mock, log, monkeypatch):
+    monkeypatch.setattr(log_module, "LOG_MAX_RECORDS", 3)
+    _reply(aioclient_mock, [_record(time) for time in range(100, 103)])
+    await log.async_poll()
+
+    _reply(aioclient_mock, [_record(time) for time in range(100, 105)])
+    assert await log.async_poll() == [_record(103), _record(104)]
+    assert log.query() == [_record(time) for time in (104, 103, 102)]
+    assert log.query(since=103) == [_record(104), _record(103)]
+    assert log.query(until=102, limit=1) == [_record(102)]
+
+
+async def _next_poll(hass, poller) -> None:
+    poller._fast_until = 0.0      # past any boost: only the gate state counts
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=LOG_POLL_FAST + 1))
+    await hass.async_block_till_done()
+
+
+async def test_poller_stays_fast_while_the_gate_is_not_closed(hass, aioclient_mock, log):
+    _reply(aioclient_mock, [])
+    poller = PalgateLogPoller(hass, log)
+    untrack = poller.async_track_gate(log.api)
+    poller.async_start()
+    await _next_poll(hass, poller)
+    assert poller.interval == 2 * LOG_POLL_FAST
+
+    log.api._enter_state(GATE_STATE_OPEN)
+    await _next_poll(hass, poller)
+    assert poller.interval == LOG_POLL_FAST
+
+    log.api._enter_state(GATE_STATE_CLOSED)
+    await _next_poll(hass, poller)
+    assert poller.interval == 2 * LOG_POLL_FAST
+
+    # An unloaded output's gate no longer keeps the poller fast
+    log.api._enter_state(GATE_STATE_OPEN)
+    untrack()
+    await _next_poll(hass, poller)
+    assert poller.interval == 2 * LOG_POLL_FAST
+
+    poller.async_stop()
+    await log.api.async_close()
+    assert log.api._transition is None
+
+
+async def test_outputs_of_one_controller_share_one_log(hass, aioclient_mock, enable_custom_integrations):
+    mock_api_replies(aioclient_mock, ["GATE1"])
+    entries = [mock_config_entry("GATE1"), mock_config_entry("GATE1:2")]
+    await async_load_entries(hass, *entries)
+
+    first, second = (hass.data[DOMAIN][entry.entry_id] for entry in entries)
+    assert first[DATA_LOG] is second[DATA_LOG]
+    assert first[DATA_ROSTER] is second[DATA_ROSTER]
+    assert calls_to(aioclient_mock, LOG_URL) == 1
+
+    # The remaining output keeps the controller, now talking through its own client
+    controller = hass.data[DATA_CONTROLLERS]["GATE1"]
+    await hass.config_entries.async_unload(entries[0].entry_id)
+    await hass.async_block_till_done()
+    assert hass.data[DATA_CONTROLLERS]["GATE1"] is controller
+    assert controller.log.api is controller.roster.api is second["api"]
+
+    await hass.config_entries.async_unload(entries[1].entry_id)
+    await hass.async_block_till_done()
+    assert "GATE1" not in hass.data[DATA_CONTROLLERS]
+    assert controller.log_poller.next_poll is None
@@ -0,0 +1,87 @@
+"""Both AES backends of pylgate derive identical tokens."""
+import random
+
+import pytest
+
+import pylgate
+from pylgate import _backend, token_generator
+from pylgate.types import TokenType
+
+pytest.importorskip("cryptography")
+
+BACKENDS = {
+    _backend.BACKEND_PYTHON: (_backend.python_decrypt_block, _backend.python_new_encryptor),
+    _backend.BACKEND_CRYPTOGRAPHY: (_backend.cryptography_decrypt_block, _backend.cryptography_new_encryptor),
+}
+
+
+def _random_cases(count: int) -> list[tuple[bytes, int, TokenType, int]]:
+    rng = random.Random(4)
+    return [
+        (
+            rng.randbytes(16),
+            rng.randrange(10**11, 10**12),
+            rng.choice(list(TokenType)),
+            rng.randrange(0, 2**31),
+        )
+        for _ in range(count)
+    ]
+
+
+def _tokens_with(monkeypatch, backend: str, cases) -> list[str]:
+    decrypt_block, new_encryptor = BACKENDS[backend]
+    with monkeypatch.context() as patch:
+        patch.setattr(token_generator, "aes_decrypt_block", decrypt_block)
+        patch.setattr(token_generator, "aes_new_encryptor", new_encryptor)
+        token_generator._cached_generator.cache_clear()
+        try:
+            return [
+                pylgate.generate_token(session_token, phone_number, token_type, timestamp_ms=timestamp)
+                for session_token, phone_number, token_type, timestamp in cases
+            ]
+        finally:
+            token_generator._cached_generator.cache_clear()
+
+
+def test_backend_selected():
+    assert pylgate.backend == _backend.BACKEND_CRYPTOGRAPHY
+
+
+def test_backends_generate_identical_tokens(monkeypatch):
+    cases = _random_cases(2000)
+
+    python_tokens = _tokens_with(monkeypatch, _backend.BACKEND_PYTHON, cases)
+    cryptography_tokens = _tokens_with(monkeypatch, _backend.BACKEND_CRYPTOGRAPHY, cases)
+
+    assert python_tokens == cryptography_tokens
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_backend_multi_block_encryptor(backend):
+    _, new_encryptor = BACKENDS[backend]
+    rng = random.Random(5)
+    key = rng.randbytes(16)
+    blocks = [rng.randbytes(16) for _ in range(8)]
+
+    encrypt = new_encryptor(key)
+    assert encrypt(b"".join(blocks)) == b"".join(encrypt(block) for block in blocks)
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_generate_tokens_batch_matches_generate_token(monkeypatch, backend):
+    cases = _random_cases(6)
+    accounts = [(session_token, phone_number, token_type) for session_token, phone_number, token_type, _ in cases]
+    timestamps = [timestamp for *_, timestamp in cases]
+
+    decrypt_block, new_encryptor = BACKENDS[backend]
+    monkeypatch.setattr(token_generator, "aes_decrypt_block", decrypt_block)
+    monkeypatch.setattr(token_generator, "aes_new_encryptor", new_encryptor)
+    token_generator._cached_generator.cache_clear()
+    try:
+        batch = pylgate.generate_tokens_batch(accounts, timestamps)
+        assert batch == [
+            [pylgate.generate_token(*account, timestamp_ms=timestamp) for timestamp in timestamps]
+            for account in accounts
+        ]
+    finally:
+        token_generator._cached_generator.cache_clear()
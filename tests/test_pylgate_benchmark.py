@@ -0,0 +1,28 @@
+"""Benchmark baselines are relative to the reference case of the same run."""
+from pylgate import benchmark
+from pylgate.benchmark import REFERENCE_CASE, BenchResult
+
+
+def _result(ops_per_sec: float) -> BenchResult:
+    return BenchResult(ops_per_sec=ops_per_sec, p50_us=1.0, p90_us=1.0, p99_us=1.0)
+
+
+def test_host_speed_does_not_cause_regressions(tmp_path):
+    path = tmp_path / "baseline.json"
+    benchmark.save_baseline({REFERENCE_CASE: _result(1000), "case": _result(4000)}, path)
+    assert benchmark.load_baseline(path) == {"case": 4.0}
+
+    # A host half as fast slows the reference as much as the case
+    slow_host = {REFERENCE_CASE: _result(500), "case": _result(2000)}
+    assert benchmark.find_regressions(slow_host, benchmark.load_baseline(path)) == {}
+
+
+def test_relative_slowdown_is_a_regression():
+    results = {REFERENCE_CASE: _result(1000), "case": _result(2000), "other": _result(900)}
+    assert benchmark.find_regressions(results, {"case": 4.0, "other": 1.0}) == {"case": (2.0, 4.0)}
+
+
+def test_run_benchmarks_times_the_reference():
+    results = benchmark.run_benchmarks(duration=0.001)
+    assert REFERENCE_CASE in results
+    assert set(benchmark.relative_speeds(results)) == set(results) - {REFERENCE_CASE}
@@ -0,0 +1,48 @@
+"""TokenGenerator cache behaviour."""
+from concurrent.futures import ThreadPoolExecutor
+import random
+
+from pylgate import generate_token
+from pylgate.token_generator import TOKEN_CACHE_SIZE, TokenGenerator
+from pylgate.types import TokenType
+
+SESSION_TOKEN = bytes.fromhex("556d89aa82bcadae3a9578fa4535a414")
+PHONE_NUMBER = 179055740422
+
+
+def test_cached_token():
+    generator = TokenGenerator(SESSION_TOKEN, PHONE_NUMBER, TokenType.PRIMARY)
+
+    assert generator.cached_token(1000) is None
+    token = generator.token(1000)
+    assert generator.cached_token(1000) == token
+    assert generator.cache_info() == (1, 1, 1)
+
+
+def test_prefetch_matches_token():
+    generator = TokenGenerator(SESSION_TOKEN, PHONE_NUMBER, TokenType.PRIMARY)
+    generator.prefetch(range(1000, 1000 + TOKEN_CACHE_SIZE))
+
+    for timestamp in range(1000, 1000 + TOKEN_CACHE_SIZE):
+        assert generator.cached_token(timestamp) == generate_token(
+            SESSION_TOKEN, PHONE_NUMBER, TokenType.PRIMARY, timestamp_ms=timestamp
+        )
+
+
+def test_shared_between_threads():
+    generator = TokenGenerator(SESSION_TOKEN, PHONE_NUMBER, TokenType.PRIMARY)
+    rng = random.Random(8)
+    timestamps = [rng.randrange(1000, 1040) for _ in range(4000)]
+
+    def work(timestamp: int) -> str:
+        if timestamp % 5 == 0:
+            generator.prefetch(range(timestamp, timestamp + 4))
+        return generator.token(timestamp)
+
+    with ThreadPoolExecutor(8) as pool:
+        tokens = list(pool.map(work, timestamps))
+
+    expected = {timestamp: TokenGenerator(SESSION_TOKEN, PHONE_NUMBER, TokenType.PRIMARY).token(timestamp)
+                for timestamp in set(timestamps)}
+    assert tokens == [expected[timestamp] for timestamp in timestamps]
+    assert generator.cache_info().size <= TOKEN_CACHE_SIZE
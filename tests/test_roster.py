@@ -0,0 +1,126 @@
+"""Local user roster: reconciling, searching, and re-reading users after our own writes."""
+import re
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from custom_components.palgate.const import BASE_URL, DATA_ROSTER, DOMAIN
+from custom_components.palgate.roster import PalgateUserRoster
+
+from .common import (
+    async_load_entries,
+    cover_entity_id,
+    make_client,
+    mock_api_replies,
+    mock_config_entry,
+)
+
+ALICE = {"id": "972501111111", "firstname": "Alice", "lastname": "Cohen"}
+BOB   = {"id": "972502222222", "firstname": "Bob", "lastname": "Levi"}
+CAROL = {"id": "+972503333333", "firstname": "Carol", "lastname": "Cohen"}
+
+
+@pytest.fixture
+async def roster(hass):
+    return PalgateUserRoster(hass, make_client(async_get_clientsession(hass)), "entry")
+
+
+async def test_search_by_phone_and_name_prefix(hass, roster):
+    roster.async_apply_users([ALICE, BOB, CAROL])
+
+    assert roster.search("cohen") == [ALICE, CAROL]
+    assert roster.search("CAR") == [CAROL]
+    assert roster.search("alice co") == [ALICE]
+    assert roster.search("+9725022") == [BOB]
+    assert roster.search("97250", limit=2) == [ALICE, BOB]
+    assert roster.search("dan") == []
+    assert roster.get("+972503333333") == CAROL
+
+
+async def test_apply_users_updates_the_index(hass, roster):
+    roster.async_apply_users([ALICE, BOB, CAROL])
+
+    renamed = {**BOB, "lastname": "Mizrahi"}
+    roster.async_apply_users([renamed, CAROL])
+
+    assert len(roster) == 2
+    assert roster.get(ALICE["id"]) is None
+    assert roster.search("alice") == []
+    assert roster.search("levi") == []
+    assert roster.search("mizrahi") == [renamed]
+    assert roster.search("cohen") == [CAROL]
+
+
+async def test_roster_is_restored_from_storage(hass, roster, hass_storage):
+    roster.async_apply_users([ALICE, BOB])
+    await hass.async_stop(force=True)
+
+    restored = PalgateUserRoster(hass, roster.api, "entry")
+    await restored.async_load()
+    assert restored.search("bob") == [BOB]
+
+
+@pytest.fixture
+async def entry(hass, aioclient_mock, enable_custom_integrations):
+    mock_api_replies(aioclient_mock, ["GATE1"])
+    entry = mock_config_entry("GATE1")
+    await async_load_entries(hass, entry)
+    yield entry
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_added_user_is_reread_from_the_server(hass, aioclient_mock, entry):
+    user_url = f"{BASE_URL}/device/GATE1/user"
+    server_record = {**ALICE, "admin": False, "dialToOpen": True}
+    aioclient_mock.post(user_url, json={"status": "ok"})
+    aioclient_mock.get(user_url, json={"user": server_record})
+
+    await hass.services.async_call(
+        DOMAIN, "add_user",
+        {"entity_id": cover_entity_id(hass, entry), "phone": ALICE["id"], "settings": {"firstname": "Alice"}},
+        blocking=True,
+    )
+
+    roster = hass.data[DOMAIN][entry.entry_id][DATA_ROSTER]
+    assert roster.get(ALICE["id"]) == server_record
+
+
+async def test_user_that_cannot_be_reread_is_not_kept_stale(hass, aioclient_mock, entry):
+    user_url = f"{BASE_URL}/device/GATE1/user"
+    aioclient_mock.put(user_url, json={"status": "ok"})
+    aioclient_mock.get(user_url, json={"user": None})
+    roster = hass.data[DOMAIN][entry.entry_id][DATA_ROSTER]
+    roster.async_apply_users([ALICE])
+
+    await hass.services.async_call(
+        DOMAIN, "set_user_settings",
+        {"entity_id": cover_entity_id(hass, entry), "phone": ALICE["id"], "settings": {"firstname": "Alicia"}},
+        blocking=True,
+    )
+
+    assert roster.get(ALICE["id"]) is None
+
+
+async def test_bulk_changes_resync_the_roster(hass, aioclient_mock, entry):
+    user_url = f"{BASE_URL}/device/GATE1/user"
+    aioclient_mock.clear_requests()
+    aioclient_mock.put(user_url, json={"status": "ok"})
+    aioclient_mock.get(re.compile(r"/users-v2"), json={"count": 2, "users": [ALICE, BOB]})
+    roster = hass.data[DOMAIN][entry.entry_id][DATA_ROSTER]
+
+    await hass.services.async_call(
+        DOMAIN, "bulk_set_user_settings",
+        {
+            "entity_id": cover_entity_id(hass, entry),
+            "users": [{"phone": ALICE["id"], "settings": {"lastname": "Cohen"}}],
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert roster.get(ALICE["id"]) == ALICE
+    assert roster.get(BOB["id"]) == BOB
@@ -0,0 +1,145 @@
+"""sync_users: loading desired user lists and diffing them against the gate."""
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import voluptuous as vol
+
+from custom_components.palgate.const import DOMAIN
+from custom_components.palgate.user_sync import compute_user_diff, load_user_file
+
+from .common import PHONE_NUMBER, async_load_entries, cover_entity_id, mock_api_replies, mock_config_entry
+
+CURRENT = [
+    {"id": "972501111111", "firstname": "Alice", "admin": False, "output1": True},
+    {"id": "972502222222", "firstname": "Bob", "admin": False, "output1": True},
+    {"id": PHONE_NUMBER, "firstname": "Home Assistant", "admin": True},
+]
+
+
+def test_diff_adds_updates_and_keeps_unchanged():
+    desired = [
+        {"phone": "972501111111", "settings": {"firstname": "Alice", "admin": False}},
+        {"phone": "+972502222222", "settings": {"firstname": "Bob", "admin": True}},
+        {"phone": "972503333333", "settings": {"firstname": "Carol"}},
+    ]
+
+    changes, unchanged = compute_user_diff(CURRENT, desired)
+
+    assert changes == [
+        ("set", "972502222222", {"admin": True}),
+        ("add", "972503333333", {"firstname": "Carol"}),
+    ]
+    assert unchanged == 1
+
+
+def test_diff_removes_missing_users_except_kept_phones():
+    desired = [{"phone": "972501111111"}]
+
+    assert compute_user_diff(CURRENT, desired) == ([], 1)
+    assert compute_user_diff(CURRENT, desired, remove_missing=True, keep=[PHONE_NUMBER]) == (
+        [("remove", "972502222222", None)],
+        1,
+    )
+
+
+def test_csv_cells_are_typed_by_setting(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "phone,firstname,lastname,admin,output1\n"
+        "972501111111,007,null,yes,1\n"
+        "972502222222,Bob,,false,\n"
+        ",Nobody,,,\n",
+        encoding="utf-8",
+    )
+
+    assert load_user_file(str(path)) == [
+        {
+            "phone": "972501111111",
+            "settings": {"firstname": "007", "lastname": "null", "admin": True, "output1": True},
+        },
+        {"phone": "972502222222", "settings": {"firstname": "Bob", "admin": False}},
+    ]
+
+
+def test_yaml_list_and_mapping(tmp_path):
+    as_list = tmp_path / "list.yaml"
+    as_list.write_text(
+        "- phone: 972501111111\n"
+        "  settings: {firstname: Alice, output1: true}\n"
+        "- phone: '972502222222'\n",
+        encoding="utf-8",
+    )
+    as_mapping = tmp_path / "mapping.yml"
+    as_mapping.write_text(
+        "972501111111: {firstname: Alice, output1: true}\n"
+        "'972502222222':\n",
+        encoding="utf-8",
+    )
+
+    expected = [
+        {"phone": "972501111111", "settings": {"firstname": "Alice", "output1": True}},
+        {"phone": "972502222222", "settings": {}},
+    ]
+    assert load_user_file(str(as_list)) == expected
+    assert load_user_file(str(as_mapping)) == expected
+
+
+@pytest.mark.parametrize(
+    ("name", "content", "message"),
+    [
+        ("bad.csv", "phone,admin\n972501111111,true\n972502222222,maybe\n", "972502222222 (.*line 3)"),
+        ("bad.csv", "phone,colour\n972501111111,red\n", "extra keys not allowed"),
+        ("bad.csv", "name\nAlice\n", "no 'phone' column"),
+        ("bad.yaml", "972501111111: notadict\n", "972501111111"),
+        ("bad.yaml", "- phone: 972501111111\n- notarecord\n", "entry 2 is not"),
+        ("bad.yaml", "- settings: {firstname: Alice}\n", "entry 1 has no phone"),
+        ("bad.yaml", "just text\n", "list or a mapping"),
+        ("bad.json", "[]", "Unsupported user file type"),
+    ],
+)
+def test_invalid_files_name_the_problem(tmp_path, name, content, message):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(HomeAssistantError, match=message):
+        load_user_file(str(path))
+
+
+@pytest.fixture
+async def entry(hass, aioclient_mock, enable_custom_integrations):
+    mock_api_replies(aioclient_mock, ["GATE1"])
+    entry = mock_config_entry("GATE1")
+    await async_load_entries(hass, entry)
+    yield entry
+    await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_sync_rejects_unknown_settings(hass, entry):
+    with pytest.raises(vol.Invalid, match="colour"):
+        await hass.services.async_call(
+            DOMAIN, "sync_users",
+            {
+                "entity_id": cover_entity_id(hass, entry),
+                "users": [{"phone": "972501111111", "settings": {"colour": "red"}}],
+                "dry_run": True,
+            },
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_sync_rejects_invalid_file(hass, entry, tmp_path):
+    path = tmp_path / "users.yaml"
+    path.write_text("972501111111: notadict\n", encoding="utf-8")
+    hass.config.allowlist_external_dirs = {str(tmp_path)}
+
+    with pytest.raises(ServiceValidationError, match="972501111111"):
+        await hass.services.async_call(
+            DOMAIN, "sync_users",
+            {"entity_id": cover_entity_id(hass, entry), "file": str(path), "dry_run": True},
+            blocking=True,
+            return_response=True,
+        )